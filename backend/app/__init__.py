@@ -6,7 +6,3 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent
 UPLOAD_DIR = BASE_DIR / "uploads"
 AUDIO_DIR = BASE_DIR / "podcast_outputs"
-
-# Create necessary directories
-UPLOAD_DIR.mkdir(exist_ok=True)
-AUDIO_DIR.mkdir(exist_ok=True) 
\ No newline at end of file
@@ -3,10 +3,14 @@ from .transcript import router as transcript_router
 from .audio import router as audio_router
 from .websocket import router as websocket_router
 from .config import router as config_router
+from .stats import router as stats_router
+from .jobs import router as jobs_router
 
 router = APIRouter()
 
 router.include_router(transcript_router, tags=["transcript"])
 router.include_router(audio_router, tags=["audio"])
 router.include_router(websocket_router, tags=["websocket"])
-router.include_router(config_router, tags=["config"]) 
\ No newline at end of file
+router.include_router(config_router, tags=["config"])
+router.include_router(stats_router, tags=["stats"])
+router.include_router(jobs_router, tags=["jobs"]) 
\ No newline at end of file
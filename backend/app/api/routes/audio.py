@@ -1,19 +1,51 @@
-from fastapi import APIRouter, HTTPException, Body
-from fastapi.responses import StreamingResponse
-from app.core.models import PodcastRequest, SingleSegmentRequest
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Body, Depends
+from fastapi.responses import FileResponse, StreamingResponse
+from app.core.models import PodcastRequest, SingleSegmentRequest, EpisodeRenderRequest
 from app.services.audio_generator import AudioGenerator
+from app.services.result_cache import make_request_key
+from app.services.single_flight import SingleFlight
 import json
+import os
+import threading
 
 router = APIRouter()
-audio_generator = AudioGenerator()
+# Identical concurrent segment requests share one synthesis
+segment_flights = SingleFlight()
 
-def format_sse(data: dict, event: str = None) -> str:
+_audio_generator: Optional[AudioGenerator] = None
+_audio_generator_lock = threading.Lock()
+
+def get_audio_generator() -> AudioGenerator:
+    """
+    Return the shared AudioGenerator, creating it on first use.
+
+    Construction creates directories, indexes the segment cache and sets up the encoder
+    pool, so it happens on the first request that needs it rather than at import. As a
+    sync dependency it runs in the threadpool, off the event loop.
+    """
+    global _audio_generator
+    if _audio_generator is None:
+        with _audio_generator_lock:
+            if _audio_generator is None:
+                _audio_generator = AudioGenerator()
+    return _audio_generator
+
+def format_sse(data: dict, event: str = None, event_id: int = None) -> str:
     """Format data as SSE message"""
     msg = f"data: {json.dumps(data)}\n"
     if event is not None:
         msg = f"event: {event}\n{msg}"
+    if event_id is not None:
+        msg = f"id: {event_id}\n{msg}"
     return f"{msg}\n"
 
+def log_update(label: str, update: dict) -> None:
+    """Log a progress update; audio chunks are skipped, as their payload is base64 audio."""
+    if update["type"] == "audio_chunk":
+        return
+    print(f"Backend yielding update ({label}): {update}")
+
 @router.post("/generate-audio")
 async def generate_audio(
     request: PodcastRequest = Body(
@@ -56,14 +88,15 @@ async def generate_audio(
                 }
             }
         }
-    )
+    ),
+    audio_generator: AudioGenerator = Depends(get_audio_generator)
 ):
     """Generate audio from transcript using voice configurations with progress streaming."""
     
     async def generate():
         try:
             async for update in audio_generator.generate(request.dict()):
-                print(f"Backend yielding update (full): {update}")
+                log_update("full", update)
                 yield format_sse(update, event=update["type"]).encode("utf-8")
         except Exception as e:
             error_response = {
@@ -125,14 +158,19 @@ async def generate_segment_audio(
                 }
             }
         }
-    )
+    ),
+    audio_generator: AudioGenerator = Depends(get_audio_generator)
 ):
     """Generate audio for a single segment using voice configuration with progress streaming."""
     
+    payload = request.dict()
+    key = make_request_key("segment", payload)
+
     async def generate():
         try:
-            async for update in audio_generator.generate_single_segment(request.dict()):
-                print(f"Backend yielding update (segment): {update}")
+            updates = segment_flights.subscribe(key, lambda: audio_generator.generate_single_segment(payload))
+            async for update in updates:
+                log_update("segment", update)
                 yield format_sse(update, event=update["type"]).encode("utf-8")
         except Exception as e:
             error_response = {
@@ -151,4 +189,50 @@ async def generate_segment_audio(
             "Content-Type": "text/event-stream",
             "X-Accel-Buffering": "no"
         }
-    )
\ No newline at end of file
+    )
+
+@router.post("/render-episode")
+async def render_episode(
+    request: EpisodeRenderRequest,
+    audio_generator: AudioGenerator = Depends(get_audio_generator)
+):
+    """
+    Mix previously generated segments into a single episode file.
+
+    With ``stream`` set, the encoded audio is streamed back while it is being written to
+    disk; otherwise the response is sent once the file is complete.
+    """
+    renderer = audio_generator.renderer
+    try:
+        segment_paths = renderer.resolve_segments(request.segments)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    episode_path = renderer.episode_path(segment_paths)
+    relative_episode_path = renderer.relative_path(episode_path)
+    audio_url = f"/audio/{relative_episode_path}"
+
+    if episode_path.exists():
+        # Rendered before from the same segments and settings
+        os.utime(episode_path)
+        if request.stream:
+            return FileResponse(episode_path, media_type="audio/mpeg", headers={"X-Episode-Url": audio_url})
+        return {"path": relative_episode_path, "audioUrl": audio_url}
+
+    if request.stream:
+        async def stream_episode():
+            async for data in renderer.render(segment_paths, episode_path):
+                yield data
+            # Only reached once the finished file has been moved into place
+            audio_generator.storage.note_write(episode_path)
+
+        return StreamingResponse(stream_episode(), media_type="audio/mpeg", headers={"X-Episode-Url": audio_url})
+
+    try:
+        async for _ in renderer.render(segment_paths, episode_path):
+            pass
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to render episode: {str(e)}")
+    audio_generator.storage.note_write(episode_path)
+
+    return {"path": relative_episode_path, "audioUrl": audio_url}
@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
 from app.core.models import (
     PodcastConfig,
     VoiceConfigurationOptions,
@@ -8,70 +10,132 @@ from app.core.models import (
     VoiceTone
 )
 from app.services.audio_generator.config import VOICE_CONFIGS, SPEAKER_CONFIG_OPTIONS
-import json
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Optional, Tuple
+import hashlib
+import json
+import os
 
 router = APIRouter(prefix="/config")
 
+# Path to speaker_configs.json file in the backend directory
+SPEAKER_CONFIGS_PATH = Path(__file__).parents[3] / "speaker_configs.json"
+
+class CachedJSON:
+    """A JSON response body serialized once, with a strong ETag derived from its content."""
+
+    def __init__(self, content: Any):
+        self.body = json.dumps(jsonable_encoder(content)).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return "*" in candidates or etag in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+def _respond(request: Request, cached: CachedJSON, cache_control: str) -> Response:
+    """Serve a cached body, or 304 Not Modified when the client already has it."""
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if _etag_matches(request, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+def _static_cache_control() -> str:
+    return f"public, max-age={settings.CONFIG_CACHE_MAX_AGE}"
+
+class SpeakerConfigsCache:
+    """Parsed speaker_configs.json, reloaded only when the file's mtime or size changes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._signature: Optional[Tuple[int, int]] = None
+        self._cached: Optional[CachedJSON] = None
+
+    def get(self) -> CachedJSON:
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._cached is None or signature != self._signature:
+            # Read and parse the speaker configs file
+            with open(self.path, "r") as f:
+                self._cached = CachedJSON(json.load(f))
+            self._signature = signature
+        return self._cached
+
+speaker_configs_cache = SpeakerConfigsCache(SPEAKER_CONFIGS_PATH)
+
+@lru_cache(maxsize=None)
+def _podcast_config() -> CachedJSON:
+    return CachedJSON(PodcastConfig())
+
+@lru_cache(maxsize=None)
+def _voice_config() -> CachedJSON:
+    return CachedJSON(VoiceConfigurationOptions())
+
+@lru_cache(maxsize=None)
+def _voice_metadata() -> CachedJSON:
+    # Convert VOICE_CONFIGS to match VoiceMetadata model
+    return CachedJSON({
+        voice_name: VoiceMetadata(
+            icon=config["icon"],
+            color=config["color"],
+            description=config["description"],
+            tags=[]  # Default empty tags array
+        )
+        for voice_name, config in VOICE_CONFIGS.items()
+    })
+
 @router.get("/", response_model=PodcastConfig)
-async def get_podcast_config():
+async def get_podcast_config(request: Request):
     """
     Get podcast configuration options including available durations, 
     number of speakers, expertise levels, and format styles.
     """
-    return PodcastConfig()
+    return _respond(request, _podcast_config(), _static_cache_control())
 
 @router.get("/voice", response_model=VoiceConfigurationOptions)
-async def get_voice_config():
+async def get_voice_config(request: Request):
     """
     Get voice configuration options including available voices,
     speaking rates, and voice characteristics.
     """
-    return VoiceConfigurationOptions()
+    return _respond(request, _voice_config(), _static_cache_control())
 
 @router.get("/voice/metadata", response_model=dict[str, VoiceMetadata])
-async def get_voice_metadata():
+async def get_voice_metadata(request: Request):
     """
     Get metadata for available voices including icons, colors,
     descriptions, and tags.
     """
-    # Convert VOICE_CONFIGS to match VoiceMetadata model
-    return {
-        voice_name: VoiceMetadata(
-            icon=config["icon"],
-            color=config["color"],
-            description=config["description"],
-            tags=[]  # Default empty tags array
-        )
-        for voice_name, config in VOICE_CONFIGS.items()
-    }
+    return _respond(request, _voice_metadata(), _static_cache_control())
 
 @router.get("/voice/speaker-mappings")
-async def get_voice_speaker_mappings():
+async def get_voice_speaker_mappings(request: Request):
     """
     Get predefined speaker configurations with voice mappings.
     This allows the frontend to map voice names to speaker configurations.
     """
     try:
-        # Path to speaker_configs.json file in the backend directory
-        configs_path = Path(__file__).parents[3] / "speaker_configs.json"
-        
-        # Read and parse the speaker configs file
-        with open(configs_path, "r") as f:
-            speaker_configs = json.load(f)
-            
-        # Return the speaker configs with their associated voice mappings
-        return speaker_configs
+        # Return the speaker configs with their associated voice mappings;
+        # clients must revalidate since the file can change without a deploy
+        return _respond(request, speaker_configs_cache.get(), "no-cache")
     except Exception as e:
         return {"error": f"Failed to load speaker configurations: {str(e)}"}
 
 @router.get("/voice/style-presets")
-async def get_voice_style_presets():
+async def get_voice_style_presets(request: Request):
     """
     Get predefined voice style presets for common use cases.
     """
+    return _respond(request, _voice_style_presets(), _static_cache_control())
+
+@lru_cache(maxsize=None)
+def _voice_style_presets() -> CachedJSON:
     # This could be expanded with actual presets
-    return {
+    return CachedJSON({
         "neutral_professional": {
             "voice_tone": "professional",
             "speaking_rate": {"normal": 150, "excited": 160, "analytical": 140},
@@ -101,4 +165,4 @@ async def get_voice_style_presets():
             }
         }
         # Add more presets as needed
-    } 
\ No newline at end of file
+    })
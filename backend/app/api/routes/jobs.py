@@ -0,0 +1,72 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Query, Depends
+from fastapi.responses import StreamingResponse
+from app.core.models import PodcastRequest
+from app.services.audio_generator import AudioGenerator
+from app.services.job_manager import job_manager, JobQueueFull
+from .audio import format_sse, get_audio_generator
+
+router = APIRouter(prefix="/jobs")
+
+@router.post("/generate-audio", status_code=202)
+async def submit_generate_audio(
+    request: PodcastRequest,
+    audio_generator: AudioGenerator = Depends(get_audio_generator)
+):
+    """
+    Submit podcast audio generation as a background job.
+
+    The job keeps running if the client disconnects; follow it with the events stream
+    and reconnect with ``Last-Event-ID`` to replay anything missed. Audio is not streamed
+    for jobs (``streamAudio`` is ignored); the finished segments are served as files.
+    """
+    # Replayable event logs are kept for the retention period, so keep base64 audio out of them
+    payload = {**request.dict(), "streamAudio": False}
+    try:
+        job = job_manager.submit("generate-audio", lambda: audio_generator.generate(payload))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {
+        **job.to_dict(),
+        "statusUrl": f"/api/jobs/{job.id}",
+        "eventsUrl": f"/api/jobs/{job.id}/events"
+    }
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Get the status of a background job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    after: Optional[int] = Query(None, description="Replay events after this id (for clients that cannot set headers)")
+):
+    """
+    Stream a job's progress events as SSE, replaying everything after ``Last-Event-ID``.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    start_after = last_event_id if last_event_id is not None else (after or 0)
+
+    async def generate():
+        async for event_id, update in job.events.subscribe(after=start_after):
+            yield format_sse(update, event=update["type"], event_id=event_id).encode("utf-8")
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "Content-Type": "text/event-stream",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends
+from app.services.audio_generator import AudioGenerator
+from app.services.job_manager import job_manager
+from app.services.rate_limiter import gemini_limiter
+from app.services.transcript_generator.transcript_generator import transcript_cache
+from .audio import get_audio_generator, segment_flights
+
+router = APIRouter(prefix="/stats")
+
+@router.get("/segment-cache")
+async def get_segment_cache_stats(audio_generator: AudioGenerator = Depends(get_audio_generator)):
+    """
+    Get segment audio cache usage and hit/miss counters.
+    """
+    if audio_generator.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **audio_generator.cache.stats()}
+
+@router.get("/encoder")
+async def get_encoder_stats(audio_generator: AudioGenerator = Depends(get_audio_generator)):
+    """
+    Get encoder pool configuration and encode latency metrics.
+    """
+    return audio_generator.encoder_pool.stats()
+
+@router.get("/gemini")
+async def get_gemini_limits():
+    """
+    Get current Gemini rate and concurrency limits and throttling counters.
+    """
+    return gemini_limiter.stats()
+
+@router.get("/jobs")
+async def get_job_stats():
+    """
+    Get background job queue depth and job counts by status.
+    """
+    return job_manager.stats()
+
+@router.get("/transcript-cache")
+async def get_transcript_cache_stats():
+    """
+    Get transcript result cache usage and coalescing counters.
+    """
+    return transcript_cache.stats()
+
+@router.get("/storage")
+async def get_storage_stats(audio_generator: AudioGenerator = Depends(get_audio_generator)):
+    """
+    Get audio storage usage against its quota and garbage collection counters.
+    """
+    return audio_generator.storage.stats()
+
+@router.get("/segment-flights")
+async def get_segment_flight_stats():
+    """
+    Get counts of deduplicated single-segment syntheses.
+    """
+    return segment_flights.stats()
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.core.models import ConceptRequest, TranscriptEditRequest, TranscriptExtendRequest
 from app.services.transcript_generator import TranscriptGenerator
+from .audio import format_sse
 
 router = APIRouter()
 transcript_generator = TranscriptGenerator()
@@ -12,6 +14,33 @@ async def generate_transcript(request: ConceptRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate-transcript-stream")
+async def generate_transcript_stream(request: ConceptRequest):
+    """Generate a transcript, streaming lines as SSE and retrying early on format errors."""
+
+    async def generate():
+        try:
+            async for update in transcript_generator.generate_stream(request):
+                yield format_sse(update, event=update["type"]).encode("utf-8")
+        except Exception as e:
+            error_response = {
+                "type": "error",
+                "stage": "generation_failed",
+                "error": e.detail if isinstance(e, HTTPException) else str(e)
+            }
+            yield format_sse(error_response, event="error").encode("utf-8")
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "Content-Type": "text/event-stream",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 @router.post("/edit-transcript")
 async def edit_transcript(request: TranscriptEditRequest):
     try:
@@ -1,13 +1,12 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from typing import Set
 from app.services.websocket_manager import ConnectionManager
-from app.services.transcript_generator import TranscriptGenerator
 from app.core.models import ConceptRequest, TranscriptEditRequest
 from app.core.config import settings
+from .transcript import transcript_generator
 
 router = APIRouter()
 manager = ConnectionManager()
-transcript_generator = TranscriptGenerator()
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -38,6 +37,26 @@ async def websocket_endpoint(websocket: WebSocket):
                             "payload": str(e)
                         })
                         
+                elif data["type"] == "generate_transcript_stream":
+                    request = ConceptRequest(**data["payload"])
+                    try:
+                        async for update in transcript_generator.generate_stream(request):
+                            if update["type"] == "complete":
+                                await websocket.send_json({
+                                    "type": "transcript_generated",
+                                    "payload": update
+                                })
+                            else:
+                                await websocket.send_json({
+                                    "type": update["type"],
+                                    "payload": update
+                                })
+                    except Exception as e:
+                        await websocket.send_json({
+                            "type": "error",
+                            "payload": str(e)
+                        })
+
                 elif data["type"] == "edit_transcript":
                     request = TranscriptEditRequest(**data["payload"])
                     try:
@@ -12,9 +12,91 @@ class Settings:
     
     # CORS settings
     CORS_ORIGINS: list = ["http://localhost:3000"]
-    
-    # Create necessary directories
-    UPLOAD_DIR.mkdir(exist_ok=True)
-    AUDIO_DIR.mkdir(exist_ok=True)
+
+    # Browser cache lifetime for static /config responses (seconds)
+    CONFIG_CACHE_MAX_AGE: int = int(os.getenv("CONFIG_CACHE_MAX_AGE", "300"))
+
+    # Gemini client (one shared client and connection pool for every service)
+    GEMINI_LOCATION: str = os.getenv("GEMINI_LOCATION", "us-central1")
+    GEMINI_MAX_CONNECTIONS: int = int(os.getenv("GEMINI_MAX_CONNECTIONS", "64"))
+    GEMINI_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("GEMINI_MAX_KEEPALIVE_CONNECTIONS", "32"))
+    GEMINI_KEEPALIVE_EXPIRY: float = float(os.getenv("GEMINI_KEEPALIVE_EXPIRY", "60"))  # seconds
+
+    # Gemini rate limiting (shared by every model call)
+    GEMINI_RATE_PER_SECOND: float = float(os.getenv("GEMINI_RATE_PER_SECOND", "10"))  # 0 disables
+    GEMINI_BURST: float = float(os.getenv("GEMINI_BURST", "20"))
+    GEMINI_CONCURRENCY_INITIAL: int = int(os.getenv("GEMINI_CONCURRENCY_INITIAL", "8"))
+    GEMINI_CONCURRENCY_MIN: int = int(os.getenv("GEMINI_CONCURRENCY_MIN", "1"))
+    GEMINI_CONCURRENCY_MAX: int = int(os.getenv("GEMINI_CONCURRENCY_MAX", "32"))
+    GEMINI_MAX_RETRIES: int = int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+    GEMINI_RETRY_BASE_DELAY: float = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "0.5"))  # seconds
+    GEMINI_RETRY_MAX_DELAY: float = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "20"))  # seconds
+
+    # Audio generation concurrency
+    AUDIO_MAX_CONCURRENCY: int = int(os.getenv("AUDIO_MAX_CONCURRENCY", "4"))  # per request
+    AUDIO_GLOBAL_CONCURRENCY: int = int(os.getenv("AUDIO_GLOBAL_CONCURRENCY", "8"))  # across all requests
+
+    # Long-turn splitting
+    LONG_TURN_CHARS: int = int(os.getenv("LONG_TURN_CHARS", "600"))  # turns longer than this get split
+    TURN_CHUNK_CHARS: int = int(os.getenv("TURN_CHUNK_CHARS", "300"))
+    TURN_CHUNK_CROSSFADE_MS: int = int(os.getenv("TURN_CHUNK_CROSSFADE_MS", "40"))
+
+    # Served audio files named by content hash are cached as immutable for this long
+    AUDIO_CACHE_MAX_AGE: int = int(os.getenv("AUDIO_CACHE_MAX_AGE", str(365 * 24 * 3600)))  # seconds
+
+    # Storage quota and garbage collection for segments and episodes (the segment cache has its own budget)
+    STORAGE_MAX_BYTES: int = int(os.getenv("STORAGE_MAX_BYTES", str(5 * 1024 * 1024 * 1024)))
+    STORAGE_MAX_FILES: int = int(os.getenv("STORAGE_MAX_FILES", "50000"))
+    STORAGE_GC_INTERVAL_SECONDS: float = float(os.getenv("STORAGE_GC_INTERVAL_SECONDS", "300"))
+    STORAGE_MIN_AGE_SECONDS: float = float(os.getenv("STORAGE_MIN_AGE_SECONDS", "900"))  # never delete newer files
+    STORAGE_RUN_RETENTION_SECONDS: float = float(os.getenv("STORAGE_RUN_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+    # Run manifests batch the segments finished within this window into one checkpoint write
+    MANIFEST_CHECKPOINT_SECONDS: float = float(os.getenv("MANIFEST_CHECKPOINT_SECONDS", "1.0"))
+
+    # Multi-speaker batching of consecutive short turns (batchTurns requests)
+    AUDIO_BATCH_MODEL: str = os.getenv("AUDIO_BATCH_MODEL", "gemini-2.5-flash-preview-tts")  # must support multi-speaker TTS
+    BATCH_TURN_MAX_CHARS: int = int(os.getenv("BATCH_TURN_MAX_CHARS", "200"))  # only turns this short are batched
+    BATCH_MAX_CHARS: int = int(os.getenv("BATCH_MAX_CHARS", "1000"))  # text per batched request
+    BATCH_MAX_TURNS: int = int(os.getenv("BATCH_MAX_TURNS", "12"))  # turns per batched request
+
+    # Voice prompts (compiled once per speaker config; optional Gemini context caching)
+    VOICE_PROMPT_CACHE_SIZE: int = int(os.getenv("VOICE_PROMPT_CACHE_SIZE", "256"))
+    VOICE_PROMPT_CONTEXT_CACHE: bool = os.getenv("VOICE_PROMPT_CONTEXT_CACHE", "false").lower() == "true"
+    VOICE_PROMPT_CONTEXT_CACHE_TTL: float = float(os.getenv("VOICE_PROMPT_CONTEXT_CACHE_TTL", "3600"))  # seconds
+
+    # Segment audio cache
+    SEGMENT_CACHE_ENABLED: bool = os.getenv("SEGMENT_CACHE_ENABLED", "true").lower() == "true"
+    SEGMENT_CACHE_MAX_BYTES: int = int(os.getenv("SEGMENT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+    # Loudness normalization
+    LOUDNESS_TARGET_LUFS: float = float(os.getenv("LOUDNESS_TARGET_LUFS", "-16.0"))
+    TRUE_PEAK_DBTP: float = float(os.getenv("TRUE_PEAK_DBTP", "-1.0"))
+
+    # Segment encoding
+    ENCODER_POOL_SIZE: int = int(os.getenv("ENCODER_POOL_SIZE", "4"))
+    ENCODER_QUEUE_DEPTH: int = int(os.getenv("ENCODER_QUEUE_DEPTH", "16"))
+    ENCODER_BITRATE_KBPS: int = int(os.getenv("ENCODER_BITRATE_KBPS", "128"))
+    # "process" runs decode/normalize/encode in worker processes, "thread" in worker threads
+    ENCODER_POOL_MODE: str = os.getenv("ENCODER_POOL_MODE", "process")
+
+    # Transcript result cache (0 TTL disables caching; identical in-flight requests still coalesce)
+    TRANSCRIPT_CACHE_TTL_SECONDS: float = float(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", "300"))
+    TRANSCRIPT_CACHE_MAX_BYTES: int = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    # Background jobs
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_SIZE: int = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    JOB_RETENTION_SECONDS: float = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+
+    # Episode rendering
+    EPISODE_FRAME_RATE: int = int(os.getenv("EPISODE_FRAME_RATE", "24000"))
+    EPISODE_BITRATE: str = os.getenv("EPISODE_BITRATE", "128k")
+    EPISODE_CHUNK_FRAMES: int = int(os.getenv("EPISODE_CHUNK_FRAMES", "65536"))
+
+    def ensure_directories(self) -> None:
+        """Create the upload and audio output directories (called from the app lifespan at startup)."""
+        self.UPLOAD_DIR.mkdir(exist_ok=True)
+        self.AUDIO_DIR.mkdir(exist_ok=True)
 
 settings = Settings() 
\ No newline at end of file
@@ -63,6 +63,12 @@ class SpeakerConfig(BaseModel):
     speaking_rate: SpeakingRate
     voice_characteristics: VoiceCharacteristics
     speech_patterns: SpeechPatterns
+    loudness_lufs: Optional[float] = Field(
+        default=None,
+        ge=-40,
+        le=-5,
+        description="Target integrated loudness for this speaker (defaults to server setting)"
+    )
 
 class VoiceConfig(BaseModel):
     voice: str = Field(..., min_length=1, description="Voice identifier")
@@ -135,6 +141,7 @@ class ConceptRequest(BaseModel):
     expertise_level: str # Assuming values like 'beginner', 'intermediate', 'expert'
     duration_minutes: int = Field(gt=0) # Duration must be positive
     format_style: str # Assuming values like 'casual', 'interview', etc.
+    useCache: bool = Field(default=True, description="Reuse a recent identical transcript instead of generating a new one")
 
 class TranscriptEditRequest(BaseModel):
     transcript: str
@@ -144,15 +151,45 @@ class TranscriptExtendRequest(BaseModel):
     transcript: str
     target_duration_minutes: int = Field(gt=0)
     characters: List[str]
+    useCache: bool = Field(default=True, description="Reuse a recent identical extension instead of generating a new one")
 
 class PodcastRequest(BaseModel):
     transcript: str = Field(..., min_length=1)
     voiceMappings: Dict[str, VoiceConfig]
+    maxConcurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of segments synthesized in parallel (defaults to server setting)"
+    )
+    eventOrder: Literal["transcript", "completion"] = Field(
+        default="transcript",
+        description="Emit segment_complete events in transcript order or as segments finish"
+    )
+    useCache: bool = Field(default=True, description="Reuse previously synthesized identical segments")
+    renderEpisode: bool = Field(default=False, description="Mix all segments into a single episode file when done")
+    streamAudio: bool = Field(default=False, description="Forward audio chunks as audio_chunk events while synthesizing")
+    splitLongTurns: bool = Field(default=False, description="Synthesize long turns as parallel sentence chunks")
+    batchTurns: bool = Field(
+        default=False,
+        description="Synthesize runs of consecutive short turns between two speakers as one multi-speaker clip"
+    )
+    resumeRunId: Optional[str] = Field(
+        default=None,
+        pattern=r"^[A-Za-z0-9_-]+$",
+        description="Resume a previous run, reusing turns its manifest records as completed"
+    )
 
 class SingleSegmentRequest(BaseModel):
     speaker: str = Field(..., min_length=1)
     text: str = Field(..., min_length=1)
     voiceConfig: VoiceConfig
+    useCache: bool = Field(default=True, description="Reuse a previously synthesized identical segment")
+    streamAudio: bool = Field(default=False, description="Forward audio chunks as audio_chunk events while synthesizing")
+    splitLongTurns: bool = Field(default=False, description="Synthesize long turns as parallel sentence chunks")
+
+class EpisodeRenderRequest(BaseModel):
+    segments: List[str] = Field(..., min_length=1, description="Segment paths relative to the audio root, in order")
+    stream: bool = Field(default=False, description="Stream the encoded episode in the response body")
 
 class PodcastConfig(BaseModel):
     duration_options: List[int] = Field(
@@ -0,0 +1,53 @@
+from typing import Optional
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# "<hash>.<ext>" (run segments, episodes) or "<cache key>.<hash>.<ext>" (cached segments)
+CONTENT_HASHED_NAME = re.compile(r"^(?:[0-9a-f]{64}\.)?([0-9a-f]{32})\.[A-Za-z0-9]+$")
+
+def content_hash_of(path: str) -> Optional[str]:
+    """Return the content hash embedded in a file name, if it has one."""
+    match = CONTENT_HASHED_NAME.match(os.path.basename(path))
+    return match.group(1) if match else None
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles that lets clients and CDNs cache content-addressed audio indefinitely.
+
+    Files named by their content hash never change under that name, so they are served
+    with the hash as a strong ETag and ``Cache-Control: immutable`` with a long max-age;
+    browsers then neither re-download nor revalidate them, including when seeking. Any
+    other file keeps Starlette's validators and must be revalidated. Byte-range and
+    ``If-Range`` requests are answered by ``FileResponse``, which sends only the
+    requested ranges straight from disk.
+    """
+
+    def __init__(self, *args, max_age: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope,
+                      status_code: int = 200) -> Response:
+        content_hash = content_hash_of(str(full_path))
+        if content_hash is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.setdefault("cache-control", "no-cache")
+            return response
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            headers={
+                "ETag": f'"{content_hash}"',
+                "Cache-Control": f"public, max-age={self.max_age}, immutable"
+            }
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -1,14 +1,34 @@
+from contextlib import asynccontextmanager
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
+from app.core.static_files import ImmutableStaticFiles
 from app.api.routes import router
+from app.api.routes.audio import get_audio_generator
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Filesystem setup happens at startup, not import; services build themselves on first use
+    settings.ensure_directories()
+
+    # The storage collector runs for the lifetime of the app. Building the generator indexes
+    # the segment cache, so it is done off the event loop.
+    provider = app.dependency_overrides.get(get_audio_generator, get_audio_generator)
+    audio_generator = await asyncio.to_thread(provider)
+    audio_generator.storage.start()
+    try:
+        yield
+    finally:
+        await audio_generator.storage.stop()
 
 app = FastAPI(
     title="AI Podcast Generator API",
     description="Generate podcasts from concepts using Google's Gemini AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,8 +40,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/audio", StaticFiles(directory=settings.AUDIO_DIR), name="audio")
+# Mount static files (the directory is created at startup, before the first request checks it)
+app.mount(
+    "/audio",
+    ImmutableStaticFiles(directory=settings.AUDIO_DIR, max_age=settings.AUDIO_CACHE_MAX_AGE, check_dir=False),
+    name="audio"
+)
 
 # Include all routes under /api prefix
 app.include_router(router, prefix="/api")
@@ -1,33 +1,180 @@
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
-from google import genai
-from google.genai.types import Content, GenerateContentConfig, Part, SpeechConfig, VoiceConfig
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
+from google.genai.types import (
+    Content, CreateCachedContentConfig, GenerateContentConfig, MultiSpeakerVoiceConfig, Part,
+    SpeakerVoiceConfig, SpeechConfig, VoiceConfig
+)
+import asyncio
+import base64
+import hashlib
+import json
 import os
-import io # Import io for BytesIO
-from pydub import AudioSegment # Ensure pydub is imported
+import secrets
+import time
 
 from app.core.config import settings
+from app.services.gemini_client import get_gemini_client
+from app.services.rate_limiter import gemini_limiter
+from app.services.transcript_parser import parse_transcript
+from .cache import SegmentCache
+from .encoder import EncoderPool
+from .manifest import RunManifest
+from .mixer import AudioMixer
+from .postprocess import AudioParts, process_segment
 from .processor import AudioProcessor
-from .utils import generate_unique_run_id
+from .renderer import EpisodeRenderer
+from .run_context import RunContext
+from .storage import StorageManager
+from .utils import chunk_text, group_turns
 from .config import VOICE_CONFIGS, SPEAKER_CONFIG_OPTIONS
 
+AUDIO_MODEL = "gemini-2.0-flash-exp"
+SEGMENT_FORMAT = "mp3" # mp3 for better browser compatibility
+
 class AudioGenerator:
     def __init__(self):
         """Initialize the AudioGenerator with necessary components."""
-        self.client = genai.Client(
-            project=settings.PROJECT_ID,
-            location="us-central1",
-            vertexai=True
-        )
         self.processor = AudioProcessor()
-        self.run_id = generate_unique_run_id()
+        self.encoder_pool = EncoderPool(
+            pool_size=settings.ENCODER_POOL_SIZE,
+            queue_depth=settings.ENCODER_QUEUE_DEPTH,
+            bitrate=settings.ENCODER_BITRATE_KBPS,
+            mode=settings.ENCODER_POOL_MODE
+        )
         self.output_dir = Path(settings.AUDIO_DIR)
         self.segments_dir = self.output_dir / "segments"
+        self.runs_dir = self.output_dir / "runs"
+        self._global_semaphore: Optional[asyncio.Semaphore] = None
+
+        # Compiled voice prompts by speaker config hash (least recently used first), and
+        # the model-side context caches created for them: hash -> (cache name future, refresh at)
+        self._voice_prompts: "OrderedDict[str, str]" = OrderedDict()
+        self._context_caches: Dict[str, Tuple[asyncio.Future, float]] = {}
         
         # Create necessary directories
         self.output_dir.mkdir(exist_ok=True)
         self.segments_dir.mkdir(exist_ok=True)
 
+        self.cache = SegmentCache(
+            root_dir=self.output_dir,
+            cache_dir=self.segments_dir / "cache",
+            max_bytes=settings.SEGMENT_CACHE_MAX_BYTES
+        ) if settings.SEGMENT_CACHE_ENABLED else None
+
+        self.renderer = EpisodeRenderer(
+            root_dir=self.output_dir,
+            episodes_dir=self.output_dir / "episodes",
+            mixer=AudioMixer(
+                crossfade_duration=self.processor.crossfade_duration,
+                silence_duration=self.processor.silence_duration
+            )
+        )
+
+        self.storage = StorageManager(
+            root_dir=self.output_dir,
+            managed_dirs=[self.segments_dir, self.renderer.episodes_dir],
+            excluded_dirs=[self.cache.cache_dir] if self.cache is not None else None,
+            runs_dir=self.runs_dir,
+            max_bytes=settings.STORAGE_MAX_BYTES,
+            max_files=settings.STORAGE_MAX_FILES,
+            interval_seconds=settings.STORAGE_GC_INTERVAL_SECONDS,
+            min_age_seconds=settings.STORAGE_MIN_AGE_SECONDS,
+            run_retention_seconds=settings.STORAGE_RUN_RETENTION_SECONDS
+        )
+
+    @property
+    def client(self):
+        """The shared Gemini client, created on first use."""
+        return get_gemini_client()
+
+    def _get_global_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore capping in-flight segment syntheses across all requests."""
+        # Created lazily so it binds to the running event loop rather than the import-time one
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(settings.AUDIO_GLOBAL_CONCURRENCY)
+        return self._global_semaphore
+
+    def _voice_prompt(self, config: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Return the config hash and compiled voice prompt for a speaker config.
+
+        Prompts are compiled once per distinct config and reused for every turn.
+        """
+        key = hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        prompt = self._voice_prompts.get(key)
+        if prompt is not None:
+            self._voice_prompts.move_to_end(key)
+            return key, prompt
+
+        prompt = self._create_voice_prompt(config)
+        self._voice_prompts[key] = prompt
+        while len(self._voice_prompts) > settings.VOICE_PROMPT_CACHE_SIZE:
+            evicted, _ = self._voice_prompts.popitem(last=False)
+            self._context_caches.pop(evicted, None)
+        return key, prompt
+
+    async def _prompt_config(self, key: str, voice_prompt: str) -> Dict[str, Any]:
+        """
+        GenerateContentConfig fields that deliver the voice prompt.
+
+        With context caching enabled the prompt is referenced as cached content, so its
+        tokens are not re-sent per turn; otherwise, or if caching is unavailable for the
+        model or the prompt is below the minimum cacheable size, it is sent as the
+        system instruction.
+        """
+        if settings.VOICE_PROMPT_CONTEXT_CACHE:
+            entry = self._context_caches.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                # Refresh a little before the server-side TTL runs out
+                refresh_at = time.monotonic() + settings.VOICE_PROMPT_CONTEXT_CACHE_TTL * 0.9
+                entry = (asyncio.ensure_future(self._create_context_cache(voice_prompt)), refresh_at)
+                self._context_caches[key] = entry
+            cache_name = await asyncio.shield(entry[0])
+            if cache_name:
+                return {"cached_content": cache_name}
+        return {"system_instruction": voice_prompt}
+
+    async def _create_context_cache(self, voice_prompt: str) -> Optional[str]:
+        """Create a model-side context cache holding the voice prompt; None if unavailable."""
+        try:
+            cached = await gemini_limiter.call(lambda: self.client.aio.caches.create(
+                model=AUDIO_MODEL,
+                config=CreateCachedContentConfig(
+                    system_instruction=voice_prompt,
+                    ttl=f"{int(settings.VOICE_PROMPT_CONTEXT_CACHE_TTL)}s",
+                    display_name="voice-prompt"
+                )
+            ))
+            return cached.name
+        except Exception as e:
+            # Remembered until the refresh time, so calls are not slowed by repeated attempts
+            print(f"Context caching unavailable, sending voice prompt as system instruction: {e}")
+            return None
+
+    @staticmethod
+    def _chunk_event(speaker: str, index: int, sequence: int, data: bytes,
+                     mime_type: Optional[str]) -> Dict[str, Any]:
+        """Build an audio_chunk SSE event carrying base64-encoded audio."""
+        return {
+            "type": "audio_chunk",
+            "stage": "streaming",
+            "speaker": speaker,
+            "index": index,
+            "sequence": sequence,
+            "mimeType": mime_type,
+            "data": base64.b64encode(data).decode("ascii")
+        }
+
+    @staticmethod
+    def _progress(current: int, total: int) -> Dict[str, Any]:
+        """Build the progress payload shared by all SSE events."""
+        return {
+            "current": current,
+            "total": total,
+            "percentage": (current / total) * 100 if total else 100
+        }
+
     def _create_voice_prompt(self, config: Dict[str, Any]) -> str:
         """
         Create a detailed voice prompt from speaker configuration.
@@ -78,25 +225,134 @@ class AudioGenerator:
 
         return "\n".join(prompt)
 
+    async def _stream_audio(
+        self,
+        contents: List[Part],
+        config: GenerateContentConfig,
+        on_chunk: Callable[[bytes, Optional[str]], Awaitable[None]],
+        model: str = AUDIO_MODEL
+    ) -> AudioParts:
+        """
+        Synthesize with the streaming API, forwarding each audio chunk as it arrives.
+
+        Returns:
+            AudioParts: Every audio chunk of the stream once it has finished.
+        """
+        chunks = []
+        # Chunks already forwarded cannot be taken back, so streams are limited but not retried
+        async with gemini_limiter.slot():
+            stream = await self.client.aio.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=config
+            )
+            async for response in stream:
+                if not response.candidates or not response.candidates[0].content:
+                    continue
+                for part in response.candidates[0].content.parts or []:
+                    if part.inline_data and part.inline_data.data:
+                        chunks.append((part.inline_data.data, part.inline_data.mime_type))
+                        await on_chunk(part.inline_data.data, part.inline_data.mime_type)
+
+        if not chunks:
+            raise ValueError("No audio generated")
+        return chunks
+
+    async def _synthesize(
+        self,
+        text: str,
+        config: GenerateContentConfig,
+        on_chunk: Optional[Callable[[bytes, Optional[str]], Awaitable[None]]] = None,
+        model: str = AUDIO_MODEL
+    ) -> AudioParts:
+        """
+        Run one model call for ``text`` and return the raw audio parts.
+
+        Decoding is left to the post-processing pool so the event loop never does CPU work.
+
+        Args:
+            text (str): The text to synthesize.
+            config (GenerateContentConfig): Generation config including the speech config
+                and the voice prompt (as system instruction or cached content).
+            on_chunk (Optional[Callable]): If given, use the streaming API and forward chunks.
+            model (str): The speech model to call.
+
+        Returns:
+            AudioParts: The (payload, mime type) audio parts of the response.
+        """
+        contents = [Part(text=text)]
+
+        if on_chunk is not None:
+            return await self._stream_audio(contents, config, on_chunk, model)
+
+        # Generate content through the async client so other requests keep being served;
+        # the shared limiter retries throttled and transient failures
+        response = await gemini_limiter.call(lambda: self.client.aio.models.generate_content(
+            model=model,
+            contents=contents,
+            config=config
+        ))
+
+        if not response.candidates:
+            raise ValueError("No audio generated")
+
+        # Get audio part and ensure it has inline_data
+        audio_part = response.candidates[0].content.parts[0]
+        if not audio_part.inline_data:
+            raise ValueError("No inline audio data found in the response")
+
+        return [(audio_part.inline_data.data, audio_part.inline_data.mime_type)]
+
     async def _generate_segment(
         self, 
         text: str, 
         voice: str, 
-        speaker_config: Dict[str, Any]
-    ) -> Tuple[Any, str]:
+        speaker_config: Dict[str, Any],
+        use_cache: bool = True,
+        on_chunk: Optional[Callable[[bytes, Optional[str]], Awaitable[None]]] = None,
+        split_long_turns: bool = False,
+        run: Optional[RunContext] = None
+    ) -> Tuple[Optional[float], str]:
         """
         Generate a single audio segment, save it, and return the relative path.
 
+        Identical segments are served from the segment cache without calling the model;
+        in that case no duration is returned. Decoding, loudness normalization and encoding
+        run on the encoder pool, off the event loop.
+
         Args:
             text (str): The text to synthesize.
             voice (str): The prebuilt voice name.
             speaker_config (Dict[str, Any]): Speaker configuration.
+            use_cache (bool): Whether to read from and write to the segment cache.
+            on_chunk (Optional[Callable]): If given, synthesize with the streaming API and
+                await this callback with (bytes, mime_type) for every audio chunk.
+            split_long_turns (bool): Split text longer than LONG_TURN_CHARS at sentence
+                boundaries and synthesize the chunks in parallel. Split turns are not streamed.
+            run (Optional[RunContext]): The run the segment belongs to (a new one if not given).
 
         Returns:
-            Tuple[Any, str]: A tuple containing the processed audio object (if needed, e.g., for duration) 
-                             and the relative path to the saved audio file.
+            Tuple[Optional[float], str]: The segment duration in seconds (None for cache hits)
+                                         and the relative path to the saved audio file.
         """
         try:
+            # Detailed prompt, compiled once per distinct speaker config
+            prompt_key, voice_prompt = self._voice_prompt(speaker_config)
+            split_turn = split_long_turns and len(text) > settings.LONG_TURN_CHARS
+            target_lufs = speaker_config.get("loudness_lufs") or settings.LOUDNESS_TARGET_LUFS
+
+            cache_key = None
+            if use_cache and self.cache is not None:
+                processing = f"lufs={target_lufs};prompt=system"
+                if split_turn:
+                    processing += f";split={settings.TURN_CHUNK_CHARS}"
+                cache_key = SegmentCache.make_key(
+                    text, voice, voice_prompt, AUDIO_MODEL, SEGMENT_FORMAT, processing=processing
+                )
+                cached_path = self.cache.lookup(cache_key)
+                if cached_path is not None:
+                    return None, self.cache.relative_path(cached_path)
+
             # Create voice configuration (without speaking_rate)
             voice_config = VoiceConfig(
                 prebuilt_voice_config={
@@ -113,215 +369,446 @@ class AudioGenerator:
             # Generate content configuration
             config = GenerateContentConfig(
                 response_modalities=["AUDIO"],
-                speech_config=speech_config
+                speech_config=speech_config,
+                **await self._prompt_config(prompt_key, voice_prompt)
             )
 
-            # Create detailed prompt
-            voice_prompt = self._create_voice_prompt(speaker_config)
+            if split_turn:
+                # Synthesize sentence chunks concurrently and stitch them back into one segment
+                chunk_texts = chunk_text(text, max_length=settings.TURN_CHUNK_CHARS)
+                chunk_parts = list(await asyncio.gather(*[
+                    self._synthesize(chunk, config) for chunk in chunk_texts
+                ]))
+            else:
+                chunk_parts = [await self._synthesize(text, config, on_chunk)]
 
-            # Generate content
-            response = self.client.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=[
-                    Part(text=voice_prompt),
-                    Part(text=text)
-                ],
-                config=config
+            return await self._save_segment(chunk_parts, cache_key, target_lufs, run)
+
+        except Exception as e:
+            # Enhanced error logging
+            import traceback
+            traceback.print_exc()
+            raise RuntimeError(f"Failed to generate audio segment: {str(e)}")
+
+    async def _generate_batch(
+        self,
+        turns: List[Tuple[str, str]],
+        voice_mappings: Dict[str, Any],
+        use_cache: bool = True,
+        on_chunk: Optional[Callable[[bytes, Optional[str]], Awaitable[None]]] = None,
+        run: Optional[RunContext] = None
+    ) -> Tuple[Optional[float], str]:
+        """
+        Synthesize several consecutive turns as one clip with a single model call.
+
+        Turns of two speakers use the multi-speaker voice config of AUDIO_BATCH_MODEL. The
+        TTS models take no system instruction, so the prompt follows their multi-speaker
+        format: a style line per speaker, then "TTS the following conversation between A
+        and B:" and the turns as "Speaker: text" lines. Turns of a single speaker are joined
+        into one ordinary segment.
+
+        Args:
+            turns (List[Tuple[str, str]]): (speaker, text) of each turn, in order.
+            voice_mappings (Dict[str, Any]): Voice and speaker config by speaker.
+            use_cache (bool): Whether to read from and write to the segment cache.
+            on_chunk (Optional[Callable]): If given, synthesize with the streaming API and
+                await this callback with (bytes, mime_type) for every audio chunk.
+            run (Optional[RunContext]): The run the clip belongs to (a new one if not given).
+
+        Returns:
+            Tuple[Optional[float], str]: The clip duration in seconds (None for cache hits)
+                                         and the relative path to the saved audio file.
+        """
+        speakers = list(dict.fromkeys(speaker for speaker, _ in turns))
+        if len(speakers) == 1:
+            voice_config = voice_mappings[speakers[0]]
+            return await self._generate_segment(
+                "\n".join(text for _, text in turns), voice_config["voice"], voice_config["config"],
+                use_cache=use_cache, on_chunk=on_chunk, run=run
             )
+        if len(speakers) > 2:
+            raise ValueError("Multi-speaker synthesis supports at most two speakers per request")
 
-            if not response.candidates:
-                raise ValueError("No audio generated")
+        try:
+            # Each persona is flattened onto one line, so none of its lines reads as a turn
+            styles = [
+                f"Voice {speaker} like this: "
+                + " ".join(self._voice_prompt(voice_mappings[speaker]['config'])[1].split("\n"))
+                for speaker in speakers
+            ]
+            text = "\n".join([
+                *styles,
+                f"TTS the following conversation between {speakers[0]} and {speakers[1]}:",
+                *(f"{speaker}: {line}" for speaker, line in turns)
+            ])
 
-            # Get audio part and ensure it has inline_data
-            audio_part = response.candidates[0].content.parts[0]
-            if not audio_part.inline_data:
-                raise ValueError("No inline audio data found in the response")
-            
-            # Get raw audio bytes and mime type
-            audio_bytes = audio_part.inline_data.data
-            mime_type = audio_part.inline_data.mime_type
-
-            # Determine audio format from mime type
-            if mime_type == "audio/wav":
-                audio_stream = io.BytesIO(audio_bytes)
-                audio_segment = AudioSegment.from_file(audio_stream, format="wav")
-            elif mime_type == "audio/mp3":
-                audio_stream = io.BytesIO(audio_bytes)
-                audio_segment = AudioSegment.from_file(audio_stream, format="mp3")
-            elif mime_type and mime_type.startswith("audio/L16"):
-                # Handle raw PCM data (L16)
-                try:
-                    # Extract rate parameter (e.g., from 'audio/L16;codec=pcm;rate=24000')
-                    # Basic parsing, might need refinement for more complex mime strings
-                    params = dict(p.split('=') for p in mime_type.split(';')[1:] if '=' in p)
-                    rate = int(params.get('rate', 24000)) # Default to 24k if not found
-                    sample_width = 2 # L16 means 16-bit = 2 bytes
-                    channels = 1 # Assume mono
-                    
-                    audio_segment = AudioSegment(
-                        data=audio_bytes,
-                        sample_width=sample_width,
-                        frame_rate=rate,
-                        channels=channels
+            # One clip is normalized as a whole, so per-speaker targets only apply when they agree
+            targets = {
+                voice_mappings[speaker]["config"].get("loudness_lufs") or settings.LOUDNESS_TARGET_LUFS
+                for speaker in speakers
+            }
+            target_lufs = targets.pop() if len(targets) == 1 else settings.LOUDNESS_TARGET_LUFS
+
+            cache_key = None
+            if use_cache and self.cache is not None:
+                voices = ";".join(f"{speaker}={voice_mappings[speaker]['voice']}" for speaker in speakers)
+                cache_key = SegmentCache.make_key(
+                    text, voices, "", settings.AUDIO_BATCH_MODEL, SEGMENT_FORMAT,
+                    processing=f"lufs={target_lufs};batch=inline"
+                )
+                cached_path = self.cache.lookup(cache_key)
+                if cached_path is not None:
+                    return None, self.cache.relative_path(cached_path)
+
+            config = GenerateContentConfig(
+                response_modalities=["AUDIO"],
+                speech_config=SpeechConfig(
+                    multi_speaker_voice_config=MultiSpeakerVoiceConfig(
+                        speaker_voice_configs=[
+                            SpeakerVoiceConfig(
+                                speaker=speaker,
+                                voice_config=VoiceConfig(
+                                    prebuilt_voice_config={"voice_name": voice_mappings[speaker]["voice"]}
+                                )
+                            )
+                            for speaker in speakers
+                        ]
                     )
-                    print(f"Successfully parsed L16 audio with rate={rate}Hz")
-                except Exception as parse_err:
-                    print(f"Error parsing L16 mime type '{mime_type}': {parse_err}")
-                    # Fallback or raise error
-                    raise ValueError(f"Could not parse L16 audio parameters from mime type: {mime_type}") from parse_err
-            else:
-                # Fallback for other unrecognized types - try letting pydub guess from stream
-                print(f"Warning: Unrecognized audio mime type '{mime_type}'. Attempting to load directly.")
-                try:
-                    audio_stream = io.BytesIO(audio_bytes)
-                    audio_segment = AudioSegment.from_file(audio_stream)
-                except Exception as load_err:
-                     print(f"Error loading audio with unrecognized mime type '{mime_type}': {load_err}")
-                     raise ValueError(f"Could not load audio data with mime type: {mime_type}") from load_err
-
-            # Process audio with our custom processor
-            processed_audio = self.processor.normalize_audio(audio_segment)
-
-            # Generate unique filename (use .mp3 for better browser compatibility)
-            segment_filename = f"{self.run_id}_{speaker_config.get('name', 'unknown')}_{generate_unique_run_id()}.mp3"
-            segment_path = self.segments_dir / segment_filename
-            
-            # Save the processed audio using the processor, explicitly setting format to mp3
-            saved_path = self.processor.save_audio(processed_audio, segment_path, format="mp3")
-            
-            # Return the processed audio object and its relative path
-            relative_path = os.path.join("segments", segment_filename) # Path relative to AUDIO_DIR
-            
-            # Make sure to return the processed audio object itself if needed for duration etc.
-            # If AudioProcessor.save_audio doesn't return the object, keep processed_audio
-            return processed_audio, relative_path 
+                )
+            )
+
+            chunk_parts = [await self._synthesize(text, config, on_chunk, model=settings.AUDIO_BATCH_MODEL)]
+            return await self._save_segment(chunk_parts, cache_key, target_lufs, run)
 
         except Exception as e:
-            # Enhanced error logging
             import traceback
             traceback.print_exc()
-            raise RuntimeError(f"Failed to generate audio segment: {str(e)}")
+            raise RuntimeError(f"Failed to generate batched audio segment: {str(e)}")
+
+    async def _save_segment(
+        self,
+        chunk_parts: List[AudioParts],
+        cache_key: Optional[str],
+        target_lufs: float,
+        run: Optional[RunContext] = None
+    ) -> Tuple[float, str]:
+        """
+        Post-process synthesized audio into a segment file.
+
+        Decoding, stitching, loudness normalization and encoding run on the encoder pool.
+        Files are named by their content hash, so a segment URL always denotes the same
+        audio and can be cached as immutable. Cached segments live under their cache key,
+        others in the run's directory.
+
+        Returns:
+            Tuple[float, str]: The segment duration in seconds and its path relative to AUDIO_DIR.
+        """
+        if cache_key is not None:
+            directory = self.cache.shard_dir(cache_key)
+        else:
+            run = run or RunContext(self.segments_dir)
+            directory = run.prepare_dir()
+
+        # Write under a temporary name and move into place once the content hash is known,
+        # so partial files are never served or cached
+        output_path = directory / f"{secrets.token_hex(8)}.tmp"
+        try:
+            # Decode, stitch, normalize and encode on the shared pool, explicitly setting the format
+            duration, content_hash = await self.encoder_pool.run(
+                process_segment, chunk_parts, output_path, SEGMENT_FORMAT, self.encoder_pool.bitrate,
+                target_lufs, settings.TRUE_PEAK_DBTP, settings.TURN_CHUNK_CROSSFADE_MS
+            )
+
+            if cache_key is not None:
+                segment_path = self.cache.path_for(cache_key, content_hash, SEGMENT_FORMAT)
+                os.replace(output_path, segment_path)
+                segment_path = self.cache.store(cache_key, segment_path)
+            else:
+                segment_path = run.segment_path(content_hash, SEGMENT_FORMAT)
+                os.replace(output_path, segment_path)
+                self.storage.note_write(segment_path)
+        finally:
+            if output_path.exists():
+                output_path.unlink()
+        
+        # Return the duration and the path relative to AUDIO_DIR
+        relative_path = segment_path.relative_to(self.output_dir).as_posix()
+        return duration, relative_path
 
     async def generate(self, request: Dict[str, Any]):
         """Generate audio from transcript with voice mappings."""
         transcript = request["transcript"]
         voice_mappings = request["voiceMappings"]
         
-        # Parse transcript into segments
-        segments = []
-        current_speaker = None
-        current_text = []
-        
-        for line in transcript.split("\n"):
-            if not line.strip():
-                continue
-                
-            if ":" in line:
-                # If we have accumulated text for a previous speaker, add it
-                if current_speaker and current_text:
-                    segments.append((current_speaker, " ".join(current_text)))
-                    current_text = []
-                
-                # Start new speaker segment
-                speaker, text = line.split(":", 1)
-                current_speaker = speaker.strip()
-                current_text = [text.strip()]
-            else:
-                # Continue previous speaker's text
-                current_text.append(line.strip())
-        
-        # Add final segment
-        if current_speaker and current_text:
-            segments.append((current_speaker, " ".join(current_text)))
+        # Parse transcript into turns (continuation lines are joined onto the previous turn)
+        turns = parse_transcript(transcript)
 
-        # Generate audio for each segment
-        audio_segments = []
-        total_segments = len(segments)
-        
-        for idx, (speaker, text) in enumerate(segments, 1):
+        # Validate voice mappings up front so no work is dispatched for a broken request
+        for speaker in {turn.speaker for turn in turns}:
             if speaker not in voice_mappings:
                 raise ValueError(f"No voice mapping found for speaker: {speaker}")
-            
-            # Yield progress update
+
+        total_segments = len(turns)
+        max_concurrency = request.get("maxConcurrency") or settings.AUDIO_MAX_CONCURRENCY
+        in_transcript_order = request.get("eventOrder", "transcript") == "transcript"
+        use_cache = request.get("useCache", True)
+        stream_audio = request.get("streamAudio", False)
+        split_long_turns = request.get("splitLongTurns", False)
+        batch_turns = request.get("batchTurns", False)
+        request_semaphore = asyncio.Semaphore(max_concurrency)
+        global_semaphore = self._get_global_semaphore()
+
+        # Checkpoint finished turns so a failed run can be resumed
+        resume_run_id = request.get("resumeRunId")
+        if resume_run_id:
+            manifest = RunManifest.load(
+                self.output_dir, self.runs_dir, resume_run_id,
+                checkpoint_interval=settings.MANIFEST_CHECKPOINT_SECONDS
+            )
+            run = RunContext(self.segments_dir, resume_run_id)
+        else:
+            run = RunContext(self.segments_dir)
+            manifest = RunManifest(
+                self.output_dir, self.runs_dir, run.run_id,
+                checkpoint_interval=settings.MANIFEST_CHECKPOINT_SECONDS
+            )
+        turn_hashes = [
+            RunManifest.turn_hash(
+                turn.speaker, turn.text, voice_mappings[turn.speaker]["voice"], voice_mappings[turn.speaker]["config"]
+            )
+            for turn in turns
+        ]
+
+        # Workers report ("started" | "chunk" | "done" | "failed", index, payload) back to this generator,
+        # where index is the first turn of the clip; "done" carries (duration, relative path, resumed)
+        events: asyncio.Queue = asyncio.Queue()
+
+        # Each clip covers one turn, or several consecutive turns when batched
+        clip_turns: Dict[int, List[int]] = {}
+        pending = []
+        index = 0
+        while index < total_segments:
+            completed = manifest.completed_unit(index, turn_hashes)
+            if completed is not None:
+                entry, covered = completed
+                clip_turns[index] = covered
+                events.put_nowait(("done", index, (entry["duration"], entry["path"], True)))
+                index += len(covered)
+            else:
+                pending.append((index, turns[index].speaker, turns[index].text))
+                index += 1
+
+        if batch_turns:
+            batches = group_turns(
+                pending,
+                max_chars=settings.BATCH_MAX_CHARS,
+                max_turns=settings.BATCH_MAX_TURNS,
+                turn_max_chars=settings.BATCH_TURN_MAX_CHARS
+            )
+        else:
+            batches = [[turn] for turn in pending]
+        for batch in batches:
+            clip_turns[batch[0][0]] = [turn_index for turn_index, _, _ in batch]
+
+        yield {
+            "type": "run_started",
+            "stage": "run_started",
+            "runId": manifest.run_id,
+            "resumed": total_segments - len(pending),
+            "progress": self._progress(0, total_segments)
+        }
+
+        async def run_segment(batch: List[Tuple[int, str, str]]):
+            index = batch[0][0]
+            covered = clip_turns[index] if len(batch) > 1 else None
+            streamed = False
+
+            def forwarder(turn_index: int):
+                async def forward_chunk(data: bytes, mime_type: Optional[str]):
+                    nonlocal streamed
+                    streamed = True
+                    await events.put(("chunk", turn_index, (data, mime_type)))
+                return forward_chunk if stream_audio else None
+
+            def record(turn_index: int, speaker: str, turns: Optional[List[int]], **outcome):
+                manifest.record(
+                    turn_index, speaker, turn_hashes[turn_index], voice_mappings[speaker]["voice"],
+                    turns=turns, **outcome
+                )
+
+            async with request_semaphore, global_semaphore:
+                await events.put(("started", index, None))
+                if covered is not None:
+                    try:
+                        duration, relative_segment_path = await self._generate_batch(
+                            [(speaker, text) for _, speaker, text in batch], voice_mappings,
+                            use_cache=use_cache, on_chunk=forwarder(index), run=run
+                        )
+                    except Exception as e:
+                        # Audio chunks already forwarded cannot be taken back
+                        if streamed:
+                            for turn_index, speaker, _ in batch:
+                                record(turn_index, speaker, covered, error=str(e))
+                            await events.put(("failed", index, e))
+                            return
+                        print(f"Batched synthesis of turns {covered} failed, generating them one by one: {e}")
+                        for turn_index, _, _ in batch:
+                            clip_turns[turn_index] = [turn_index]
+                    else:
+                        for turn_index, speaker, _ in batch:
+                            record(turn_index, speaker, covered, path=relative_segment_path, duration=duration)
+                        await events.put(("done", index, (duration, relative_segment_path, False)))
+                        return
+
+                for turn_index, speaker, text in batch:
+                    try:
+                        duration, relative_segment_path = await self._generate_segment(
+                            text, voice_mappings[speaker]["voice"], voice_mappings[speaker]["config"],
+                            use_cache=use_cache, on_chunk=forwarder(turn_index),
+                            split_long_turns=split_long_turns, run=run
+                        )
+                    except Exception as e:
+                        record(turn_index, speaker, None, error=str(e))
+                        await events.put(("failed", turn_index, e))
+                        return
+                    record(turn_index, speaker, None, path=relative_segment_path, duration=duration)
+                    await events.put(("done", turn_index, (duration, relative_segment_path, False)))
+
+        tasks = [asyncio.ensure_future(run_segment(batch)) for batch in batches]
+
+        audio_segments = [None] * total_segments
+        finished: Dict[int, Tuple[Optional[float], str, bool]] = {}
+        next_index = 0
+        emitted = 0
+        chunk_sequence: Dict[int, int] = {}
+
+        try:
+            while emitted < total_segments:
+                kind, index, payload = await events.get()
+                speaker = turns[index].speaker
+                covered = clip_turns[index]
+                speakers = list(dict.fromkeys(turns[turn_index].speaker for turn_index in covered))
+
+                if kind == "started":
+                    yield {
+                        "type": "progress",
+                        "stage": "generating",
+                        "message": f"Generating audio for {', '.join(speakers)}",
+                        "speaker": speaker,
+                        "speakers": speakers,
+                        "index": index,
+                        "turns": covered,
+                        "progress": self._progress(covered[-1] + 1, total_segments)
+                    }
+                    continue
+
+                if kind == "chunk":
+                    # Audio chunks are forwarded immediately, whatever the event order
+                    yield self._chunk_event(speaker, index, chunk_sequence.get(index, 0), *payload)
+                    chunk_sequence[index] = chunk_sequence.get(index, 0) + 1
+                    continue
+
+                if kind == "failed":
+                    yield {
+                        "type": "error",
+                        "stage": "segment_failed",
+                        "speaker": speaker,
+                        "speakers": speakers,
+                        "index": index,
+                        "turns": covered,
+                        "runId": manifest.run_id,
+                        "error": str(payload),
+                        "progress": self._progress(covered[-1] + 1, total_segments)
+                    }
+                    raise payload
+
+                finished[index] = payload
+                if in_transcript_order:
+                    ready = []
+                    while next_index in finished:
+                        ready.append(next_index)
+                        next_index += len(clip_turns[next_index])
+                else:
+                    ready = [index]
+
+                for ready_index in ready:
+                    duration, relative_segment_path, resumed = finished.pop(ready_index)
+                    ready_speaker = turns[ready_index].speaker
+                    ready_turns = clip_turns[ready_index]
+                    ready_speakers = list(dict.fromkeys(turns[turn_index].speaker for turn_index in ready_turns))
+                    emitted += len(ready_turns)
+
+                    # Yield segment completion with the relative path for the frontend
+                    # Use the correct static mount path defined in main.py
+                    yield {
+                        "type": "segment_complete",
+                        "stage": "segment_generated",
+                        "speaker": ready_speaker,
+                        "speakers": ready_speakers,
+                        "index": ready_index,
+                        "turns": ready_turns,
+                        "audioUrl": f"/audio/{relative_segment_path}",
+                        "duration": duration,
+                        "resumed": resumed,
+                        "progress": self._progress(emitted, total_segments)
+                    }
+
+                    audio_segments[ready_index] = {
+                        "speaker": ready_speaker,
+                        "path": relative_segment_path, # Store relative path internally if needed
+                        "duration": duration,
+                        "turns": ready_turns
+                    }
+        finally:
+            # Stop outstanding work if a segment failed or the client went away
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await manifest.close()
+
+        # A batched clip fills the slot of its first turn only
+        audio_segments = [segment for segment in audio_segments if segment is not None]
+
+        if request.get("renderEpisode"):
             yield {
                 "type": "progress",
-                "stage": "generating",
-                "message": f"Generating audio for {speaker}",
-                "speaker": speaker,
-                "progress": {
-                    "current": idx,
-                    "total": total_segments,
-                    "percentage": (idx / total_segments) * 100
-                }
+                "stage": "rendering",
+                "message": "Rendering episode",
+                "progress": self._progress(total_segments, total_segments)
             }
-            
-            # Get voice configuration
-            voice_config = voice_mappings[speaker]
-            voice = voice_config["voice"]
-            speaker_config = voice_config["config"]
-            
-            # Generate segment
-            try:
-                # segment_result is the processed audio object, segment_path is the relative URL
-                segment_result, relative_segment_path = await self._generate_segment(text, voice, speaker_config) 
-                
-                # Yield segment completion with the relative path for the frontend
-                # Use the correct static mount path defined in main.py
-                audio_url = f"/audio/{relative_segment_path}"
-                yield {
-                    "type": "segment_complete",
-                    "stage": "segment_generated",
-                    "speaker": speaker,
-                    "audioUrl": audio_url, # Use the constructed static URL
-                    "duration": segment_result.duration if hasattr(segment_result, 'duration') else None, 
-                    "progress": {
-                        "current": idx,
-                        "total": total_segments,
-                        "percentage": (idx / total_segments) * 100
-                    }
-                }
-                
-                audio_segments.append({
-                    "speaker": speaker,
-                    "path": relative_segment_path, # Store relative path internally if needed
-                    "duration": segment_result.duration if hasattr(segment_result, 'duration') else None
-                })
-                
-            except Exception as e:
-                yield {
-                    "type": "error",
-                    "stage": "segment_failed",
-                    "speaker": speaker,
-                    "error": str(e),
-                    "progress": {
-                        "current": idx,
-                        "total": total_segments,
-                        "percentage": (idx / total_segments) * 100
-                    }
-                }
-                raise
-        
+
+            segment_paths = self.renderer.resolve_segments([segment["path"] for segment in audio_segments])
+            episode_path = self.renderer.episode_path(segment_paths)
+            if episode_path.exists():
+                # Touch it so storage GC treats the reused episode as recently used
+                os.utime(episode_path)
+            else:
+                async for _ in self.renderer.render(segment_paths, episode_path):
+                    pass
+                self.storage.note_write(episode_path)
+
+            relative_episode_path = self.renderer.relative_path(episode_path)
+            yield {
+                "type": "episode_complete",
+                "stage": "episode_rendered",
+                "path": relative_episode_path,
+                "audioUrl": f"/audio/{relative_episode_path}",
+                "progress": self._progress(total_segments, total_segments)
+            }
+
         # Final completion message
         yield {
             "type": "complete",
             "stage": "generation_complete",
             "message": "Audio generation complete",
+            "runId": manifest.run_id,
             "segments": audio_segments,
-            "progress": {
-                "current": total_segments,
-                "total": total_segments,
-                "percentage": 100
-            }
+            "progress": self._progress(total_segments, total_segments)
         }
 
     def parse_transcript(self, transcript: str) -> List[Tuple[str, str]]:
         """Parse transcript into list of (speaker, text) tuples."""
-        dialogue = []
-        for line in transcript.split('\n'):
-            if ':' in line:
-                speaker, text = line.split(':', 1)
-                dialogue.append((speaker.strip(), text.strip()))
-        return dialogue
+        return [(turn.speaker, turn.text) for turn in parse_transcript(transcript)]
 
     async def generate_single_segment(self, request: Dict[str, Any]):
         """Generate audio for a single segment with voice configuration."""
@@ -361,8 +848,40 @@ class AudioGenerator:
             }
             
             # Generate the audio segment
-            # segment_audio is the processed audio object, relative_segment_path is the relative URL
-            segment_audio, relative_segment_path = await self._generate_segment(text, voice, speaker_config)
+            use_cache = request.get("useCache", True)
+            split_long_turns = request.get("splitLongTurns", False)
+            if request.get("streamAudio", False):
+                chunks: asyncio.Queue = asyncio.Queue()
+
+                async def forward_chunk(data: bytes, mime_type: Optional[str]):
+                    await chunks.put((data, mime_type))
+
+                async def run_segment():
+                    try:
+                        return await self._generate_segment(
+                            text, voice, speaker_config, use_cache=use_cache, on_chunk=forward_chunk,
+                            split_long_turns=split_long_turns
+                        )
+                    finally:
+                        await chunks.put(None)  # End of stream
+
+                task = asyncio.ensure_future(run_segment())
+                sequence = 0
+                try:
+                    while True:
+                        chunk = await chunks.get()
+                        if chunk is None:
+                            break
+                        yield self._chunk_event(speaker, 0, sequence, *chunk)
+                        sequence += 1
+                finally:
+                    if not task.done():
+                        task.cancel()
+                duration, relative_segment_path = await task
+            else:
+                duration, relative_segment_path = await self._generate_segment(
+                    text, voice, speaker_config, use_cache=use_cache, split_long_turns=split_long_turns
+                )
             
             # Yield segment completion with the RELATIVE path for the frontend hook
             yield {
@@ -370,7 +889,7 @@ class AudioGenerator:
                 "stage": "segment_generated",
                 "speaker": speaker,
                 "segment_path": relative_segment_path, # Use relative_segment_path with key segment_path
-                "duration": segment_audio.duration if hasattr(segment_audio, 'duration') else None,
+                "duration": duration,
                 "progress": {
                     "current": 1,
                     "total": 1,
@@ -386,7 +905,7 @@ class AudioGenerator:
                 "segments": [{
                     "speaker": speaker,
                     "path": relative_segment_path, # Store relative path internally if needed
-                    "duration": segment_audio.duration if hasattr(segment_audio, 'duration') else None
+                    "duration": duration
                 }],
                 "progress": {
                     "current": 1,
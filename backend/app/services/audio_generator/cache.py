@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import os
+
+class SegmentCache:
+    """
+    Content-addressed cache of synthesized audio segments with LRU eviction.
+
+    Entries are stored as ``<key>.<content hash>.<format>`` files in ``cache_dir``, sharded
+    into subdirectories by the first two characters of the key; the key is a hash of
+    everything that influences the synthesized audio, so identical requests map to the same
+    entry and never hit the model twice. The content hash makes the name change whenever
+    an entry is synthesized again, so a file name always denotes the same bytes.
+    """
+
+    def __init__(self, root_dir: Path, cache_dir: Path, max_bytes: int):
+        self.root_dir = Path(root_dir)
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> (path relative to cache_dir, size in bytes), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(text: str, voice: str, voice_prompt: str, model: str, output_format: str,
+                 processing: str = "") -> str:
+        """
+        Hash all inputs that determine the synthesized audio into a cache key.
+
+        ``processing`` describes post-processing applied after synthesis (e.g. the
+        loudness target) so differently processed variants do not collide.
+        """
+        payload = json.dumps([text, voice, voice_prompt, model, output_format, processing], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        """Rebuild the index from disk, using modification time as the recency order."""
+        files = []
+        for directory, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                files.append((stat.st_mtime, os.path.relpath(path, self.cache_dir), stat.st_size))
+
+        for _, relative, size in sorted(files):
+            key = os.path.basename(relative).split(".", 1)[0]
+            self._entries[key] = (Path(relative).as_posix(), size)
+            self._total_bytes += size
+
+        self._evict()
+
+    def shard_dir(self, key: str) -> Path:
+        """Directory holding the entry for ``key``; created if missing."""
+        shard = self.cache_dir / key[:2]
+        shard.mkdir(exist_ok=True)
+        return shard
+
+    def path_for(self, key: str, content_hash: str, output_format: str) -> Path:
+        """Path under which the entry for ``key`` with the given contents is stored."""
+        return self.shard_dir(key) / f"{key}.{content_hash}.{output_format}"
+
+    def relative_path(self, path: Path) -> str:
+        """Path of a cache file relative to the audio root, as served under /audio."""
+        return Path(path).relative_to(self.root_dir).as_posix()
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """
+        Return the stored file for ``key`` and mark it as recently used.
+
+        Returns:
+            Optional[Path]: Path of the cached file, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            path = self.cache_dir / entry[0]
+            if path.exists():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    # Persist recency so the LRU order survives restarts
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+
+            # File vanished underneath us; forget it
+            self._entries.pop(key)
+            self._total_bytes -= entry[1]
+
+        self.misses += 1
+        return None
+
+    def store(self, key: str, path: Path) -> Path:
+        """
+        Register a freshly written file for ``key`` and evict old entries if over budget.
+
+        If another synthesis of the same key was stored first (identical segments generated
+        concurrently), that entry is kept, since its URL may already have been handed out,
+        and the new file is discarded.
+
+        Returns:
+            Path: The file now stored for ``key``
+        """
+        path = Path(path)
+        relative = path.relative_to(self.cache_dir).as_posix()
+        previous = self._entries.get(key)
+        if previous is not None and previous[0] != relative:
+            existing = self.cache_dir / previous[0]
+            if existing.exists():
+                self._entries.move_to_end(key)
+                path.unlink()
+                return existing
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous[1]
+
+        size = path.stat().st_size
+        self._entries[key] = (relative, size)
+        self._total_bytes += size
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its byte budget."""
+        # Never evict the most recent entry, even if it alone exceeds the budget
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (filename, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                (self.cache_dir / filename).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current usage."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
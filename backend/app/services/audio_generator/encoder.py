@@ -0,0 +1,163 @@
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Tuple
+import asyncio
+import multiprocessing
+import time
+import wave
+
+from pydub import AudioSegment
+
+try:
+    import lameenc
+except ImportError:  # Optional: fall back to pydub/ffmpeg export
+    lameenc = None
+
+def encode_to_file(audio: AudioSegment, path: Path, format: str = "mp3", bitrate: int = 128) -> bool:
+    """
+    Encode an audio segment to ``path``, in-process where possible.
+
+    MP3 is encoded with lameenc and WAV is written with the standard library, so neither
+    spawns a subprocess. Other formats, or MP3 without lameenc installed, go through
+    ``AudioSegment.export`` and therefore one ffmpeg process per call.
+
+    Returns:
+        bool: True if the in-process encoder was used
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if format == "mp3" and lameenc is not None:
+        audio = audio.set_sample_width(2)
+        if audio.channels > 2:
+            audio = audio.set_channels(2)
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(bitrate)
+        encoder.set_in_sample_rate(audio.frame_rate)
+        encoder.set_channels(audio.channels)
+        encoder.set_quality(2)
+        with open(path, "wb") as f:
+            f.write(encoder.encode(audio.raw_data))
+            f.write(encoder.flush())
+        return True
+
+    if format == "wav":
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(audio.channels)
+            f.setsampwidth(audio.sample_width)
+            f.setframerate(audio.frame_rate)
+            f.writeframes(audio.raw_data)
+        return True
+
+    audio.export(str(path), format=format)
+    return False
+
+def _timed(fn: Callable[..., Tuple[bool, Any]], *args):
+    """Run a job on a worker and report how long the job itself took."""
+    started = time.perf_counter()
+    used_in_process, result = fn(*args)
+    return used_in_process, result, time.perf_counter() - started
+
+class EncoderPool:
+    """
+    Pool of long-lived workers for CPU-bound post-processing and encoding.
+
+    Jobs run on ``pool_size`` workers that live for the whole process: threads, or with
+    ``mode="process"`` worker processes so decode, loudness and encode work scales across
+    cores instead of contending for the GIL. At most ``pool_size + queue_depth`` jobs are
+    admitted at a time; further callers wait for a slot, which applies backpressure
+    instead of queueing unbounded PCM buffers.
+    """
+
+    def __init__(self, pool_size: int, queue_depth: int, bitrate: int = 128, mode: str = "thread"):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown encoder pool mode: {mode}")
+        self.pool_size = pool_size
+        self.queue_depth = queue_depth
+        self.bitrate = bitrate
+        self.mode = mode
+        self._executor: Executor
+        if mode == "process":
+            # Spawned rather than forked: the parent runs an event loop and other threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=pool_size, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="encoder")
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Metrics
+        self.completed = 0
+        self.failed = 0
+        self.in_process = 0
+        self.in_flight = 0
+        self._latencies = deque(maxlen=1000)  # seconds, most recent encodes
+        self._queue_waits = deque(maxlen=1000)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop rather than the import-time one
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size + self.queue_depth)
+        return self._slots
+
+    async def run(self, fn: Callable[..., Tuple[bool, Any]], *args) -> Any:
+        """
+        Run ``fn(*args)`` on a worker and return its result.
+
+        ``fn`` must be a module-level function (so it can be sent to worker processes)
+        returning ``(used_in_process_encoder, result)``. If the caller is cancelled while
+        the job is running, this waits for the job to finish before re-raising, so the
+        caller's cleanup never races files the job is still writing.
+        """
+        submitted = time.perf_counter()
+        async with self._get_slots():
+            self.in_flight += 1
+            job = self._executor.submit(_timed, fn, *args)
+            outcome = asyncio.wrap_future(job)
+            try:
+                used_in_process, result, encode_seconds = await asyncio.shield(outcome)
+            except asyncio.CancelledError:
+                # A job that has started cannot be interrupted; it keeps its slot until it stops
+                if not job.cancel():
+                    await asyncio.gather(outcome, return_exceptions=True)
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+        self.completed += 1
+        self.in_process += int(used_in_process)
+        self._latencies.append(encode_seconds)
+        # Everything that was not encoding was spent waiting for a slot or a worker
+        self._queue_waits.append(time.perf_counter() - submitted - encode_seconds)
+        return result
+
+    @staticmethod
+    def _summarize(samples) -> Dict[str, float]:
+        if not samples:
+            return {"avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(samples)
+        return {
+            "avg_ms": sum(ordered) / len(ordered) * 1000,
+            "p50_ms": ordered[len(ordered) // 2] * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            "max_ms": ordered[-1] * 1000
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool configuration and encode latency metrics."""
+        return {
+            "mode": self.mode,
+            "pool_size": self.pool_size,
+            "queue_depth": self.queue_depth,
+            "in_process_encoder": lameenc is not None,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_process_encodes": self.in_process,
+            "encode_latency": self._summarize(self._latencies),
+            "queue_wait": self._summarize(self._queue_waits)
+        }
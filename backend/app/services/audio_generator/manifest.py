@@ -0,0 +1,143 @@
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+
+RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+class RunManifest:
+    """
+    Per-run checkpoint of finished segments, stored at ``runs/<run_id>/manifest.json``.
+
+    Finished segments are checkpointed so a run that fails part-way can be resumed and
+    only the missing or failed turns are synthesized again. Writes are debounced: the
+    segments recorded within ``checkpoint_interval`` seconds share one atomic rewrite,
+    done in a worker thread, and ``close`` writes whatever is still pending.
+    """
+
+    def __init__(self, root_dir: Path, runs_dir: Path, run_id: str, data: Optional[Dict[str, Any]] = None,
+                 checkpoint_interval: float = 1.0):
+        if not RUN_ID_PATTERN.match(run_id):
+            raise ValueError(f"Invalid run id: {run_id}")
+        self.root_dir = Path(root_dir)
+        self.run_id = run_id
+        self.path = Path(runs_dir) / run_id / "manifest.json"
+        now = time.time()
+        self.data = data or {
+            "runId": run_id,
+            "createdAt": now,
+            "updatedAt": now,
+            "segments": {}
+        }
+        self.checkpoint_interval = checkpoint_interval
+        self._dirty = False
+        self._checkpoint: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    @classmethod
+    def load(cls, root_dir: Path, runs_dir: Path, run_id: str, checkpoint_interval: float = 1.0) -> "RunManifest":
+        """
+        Load an existing run manifest.
+
+        Raises:
+            ValueError: If the run id is invalid or no manifest exists for it
+        """
+        manifest = cls(root_dir, runs_dir, run_id, checkpoint_interval=checkpoint_interval)
+        if not manifest.path.exists():
+            raise ValueError(f"No manifest found for run: {run_id}")
+        with open(manifest.path, "r", encoding="utf-8") as f:
+            manifest.data = json.load(f)
+        return manifest
+
+    @staticmethod
+    def turn_hash(speaker: str, text: str, voice: str, speaker_config: Dict[str, Any]) -> str:
+        """Hash everything that determines a turn's audio, so edited turns are never reused."""
+        payload = json.dumps([speaker, text, voice, speaker_config], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def completed(self, index: int, text_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the recorded entry for a turn if it finished with the same inputs
+        and its audio file still exists.
+        """
+        entry = self.data["segments"].get(str(index))
+        if entry is None or entry.get("status") != "completed" or entry.get("textHash") != text_hash:
+            return None
+        if not (self.root_dir / entry["path"]).exists():
+            return None
+        return entry
+
+    def completed_unit(self, index: int, turn_hashes: List[str]) -> Optional[Tuple[Dict[str, Any], List[int]]]:
+        """
+        Return the entry and covered turn indices if the clip starting at ``index`` finished
+        with the same inputs. A batched clip counts only if every turn it covers is unchanged.
+        """
+        entry = self.completed(index, turn_hashes[index])
+        if entry is None:
+            return None
+        turns = entry.get("turns") or [index]
+        if turns[0] != index or turns[-1] >= len(turn_hashes):
+            return None
+        for other in turns[1:]:
+            other_entry = self.completed(other, turn_hashes[other])
+            if other_entry is None or other_entry["path"] != entry["path"]:
+                return None
+        return entry, turns
+
+    def record(self, index: int, speaker: str, text_hash: str, voice: str,
+               path: Optional[str] = None, duration: Optional[float] = None,
+               error: Optional[str] = None, turns: Optional[List[int]] = None) -> None:
+        """
+        Record a finished or failed turn and schedule a checkpoint of the manifest.
+
+        ``turns`` lists every turn covered when the turn was synthesized as part of a batch.
+        """
+        self.data["segments"][str(index)] = {
+            "index": index,
+            "speaker": speaker,
+            "textHash": text_hash,
+            "voice": voice,
+            "path": path,
+            "duration": duration,
+            "status": "failed" if error is not None else "completed",
+            "error": error,
+            "turns": turns
+        }
+        self._dirty = True
+        if self._checkpoint is None:
+            self._checkpoint = asyncio.ensure_future(self._checkpoint_later())
+
+    async def _checkpoint_later(self) -> None:
+        await asyncio.sleep(self.checkpoint_interval)
+        self._checkpoint = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write recorded changes to disk now, if there are any."""
+        async with self._write_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self.data["updatedAt"] = time.time()
+            # Entries are replaced, never mutated, so a shallow copy is a stable snapshot
+            snapshot = {**self.data, "segments": dict(self.data["segments"])}
+            await asyncio.to_thread(self._write, snapshot)
+
+    async def close(self) -> None:
+        """Cancel the scheduled checkpoint and write anything still pending."""
+        checkpoint, self._checkpoint = self._checkpoint, None
+        if checkpoint is not None:
+            checkpoint.cancel()
+        await self.flush()
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        # Written atomically so a crash never leaves a truncated file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,248 @@
+from typing import Iterator, List, Tuple
+import numpy as np
+from pydub import AudioSegment
+
+# Gain pydub fades to/from; db_to_float(-120)
+_FADE_FLOOR = 10 ** (-120 / 20)
+
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+class AudioMixer:
+    """
+    Linear-time mixer that joins segments with silence gaps and crossfades.
+
+    Produces the same result as chaining ``AudioSegment.append(silence, crossfade)`` and
+    ``AudioSegment.append(segment, crossfade)`` for every segment, but computes the final
+    length up front, writes into one preallocated sample buffer and only touches the
+    crossfade regions a second time. Building an N-segment episode is therefore O(total
+    samples) instead of O(N * total samples).
+
+    Crossfades are clamped to the length of the shorter side of each join, where chained
+    ``append`` calls would raise instead.
+    """
+
+    def __init__(self, crossfade_duration: int = 1000, silence_duration: int = 500):
+        self.crossfade_duration = crossfade_duration  # milliseconds
+        self.silence_duration = silence_duration  # milliseconds
+
+    @staticmethod
+    def _sync(segments: List[AudioSegment]) -> Tuple[List[AudioSegment], int, int, int]:
+        """Bring all segments to a common frame rate, channel count and sample width."""
+        channels = max(seg.channels for seg in segments)
+        frame_rate = max(seg.frame_rate for seg in segments)
+        sample_width = max(seg.sample_width for seg in segments)
+        if sample_width == 3:
+            sample_width = 4  # No native 24-bit dtype; widen like pydub does for processing
+
+        synced = [
+            seg.set_channels(channels).set_frame_rate(frame_rate).set_sample_width(sample_width)
+            for seg in segments
+        ]
+        return synced, frame_rate, channels, sample_width
+
+    @staticmethod
+    def to_array(segment: AudioSegment) -> np.ndarray:
+        """View a segment's PCM data as a (frames, channels) integer array without copying."""
+        dtype = _SAMPLE_DTYPES[segment.sample_width]
+        return np.frombuffer(segment.raw_data, dtype=dtype).reshape(-1, segment.channels)
+
+    @staticmethod
+    def _fade_curve(frames: int, frame_rate: int, fade_in: bool) -> np.ndarray:
+        """
+        Gain curve of a pydub fade across ``frames`` frames.
+
+        Like pydub, fades longer than 100ms step the gain once per millisecond and shorter
+        fades step it once per frame.
+        """
+        start, end = (_FADE_FLOOR, 1.0) if fade_in else (1.0, _FADE_FLOOR)
+        duration_ms = int(round(frames * 1000 / frame_rate))
+
+        if duration_ms > 100:
+            steps = start + (end - start) / duration_ms * np.arange(duration_ms, dtype=np.float64)
+            # Number of frames covered by each millisecond step
+            boundaries = (np.arange(duration_ms + 1) * frame_rate) // 1000
+            boundaries[-1] = frames
+            curve = np.repeat(steps, np.diff(boundaries).clip(min=0))
+        else:
+            curve = start + (end - start) / max(frames, 1) * np.arange(frames, dtype=np.float64)
+
+        return curve[:frames, np.newaxis]
+
+    def _apply_fade(self, buffer: np.ndarray, start: int, end: int, frame_rate: int,
+                    fade_in: bool, info: np.iinfo) -> None:
+        """Fade ``buffer[start:end]`` in place."""
+        if end <= start:
+            return
+        region = buffer[start:end].astype(np.float64)
+        region *= self._fade_curve(end - start, frame_rate, fade_in)
+        buffer[start:end] = np.floor(region).clip(info.min, info.max)
+
+    def _crossfade_frames(self, left_frames: int, right_frames: int, frame_rate: int) -> int:
+        """Crossfade length in frames, clamped to both sides of the join."""
+        frames = self.crossfade_duration * frame_rate // 1000
+        return max(0, min(frames, left_frames, right_frames))
+
+    def plan(self, lengths: List[int], frame_rate: int) -> Tuple[List[Tuple[int, int, int]], int]:
+        """
+        Compute where every segment lands in the output before touching any samples.
+
+        Args:
+            lengths: Length of each segment in frames
+            frame_rate: Common frame rate of the segments
+
+        Returns:
+            Tuple of ``(placements, total_frames)`` where each placement is
+            ``(offset, tail_fade, crossfade)``: the output offset of the segment, the number
+            of frames faded out before the silence gap and the crossfade with the previous
+            audio, all in frames.
+        """
+        silence_frames = self.silence_duration * frame_rate // 1000
+        placements = []
+        total = 0
+
+        for index, length in enumerate(lengths):
+            if index == 0:
+                placements.append((0, 0, 0))
+                total = length
+                continue
+
+            # Append the silence gap, fading out the tail of what we have so far
+            tail_fade = self._crossfade_frames(total, silence_frames, frame_rate)
+            total += silence_frames - tail_fade
+
+            # Append the next segment, crossfading with the (partially silent) tail
+            crossfade = self._crossfade_frames(total, length, frame_rate)
+            placements.append((total - crossfade, tail_fade, crossfade))
+            total += length - crossfade
+
+        return placements, total
+
+    def mix_arrays(self, arrays: List[np.ndarray], frame_rate: int, dtype=np.int16) -> np.ndarray:
+        """
+        Mix (frames, channels) sample arrays into one preallocated output array.
+
+        Args:
+            arrays: Segment samples sharing frame rate, channel count and dtype
+            frame_rate: Common frame rate of the segments
+            dtype: Integer sample type of the output
+
+        Returns:
+            np.ndarray: Mixed (frames, channels) samples
+        """
+        if not arrays:
+            raise ValueError("No audio segments provided")
+
+        info = np.iinfo(dtype)
+        channels = arrays[0].shape[1]
+        placements, total_frames = self.plan([len(array) for array in arrays], frame_rate)
+        output = np.zeros((total_frames, channels), dtype=dtype)
+
+        written = 0  # Frames of real audio written so far (silence is already zero)
+        for array, (offset, tail_fade, crossfade) in zip(arrays, placements):
+            if written:
+                # Tail fade into the silence gap
+                self._apply_fade(output, written - tail_fade, written, frame_rate, False, info)
+
+                if crossfade:
+                    # Fade out the existing tail, then mix in the faded-in head of the segment
+                    self._apply_fade(output, offset, offset + crossfade, frame_rate, False, info)
+                    head = np.floor(
+                        array[:crossfade].astype(np.float64) * self._fade_curve(crossfade, frame_rate, True)
+                    )
+                    mixed = output[offset:offset + crossfade].astype(np.float64) + head
+                    output[offset:offset + crossfade] = mixed.clip(info.min, info.max)
+
+            output[offset + crossfade:offset + len(array)] = array[crossfade:]
+            written = offset + len(array)
+
+        return output
+
+    def stream(self, frame_rate: int, channels: int = 1, dtype=np.int16,
+               chunk_frames: int = 65536) -> "MixStream":
+        """Start an incremental mix that emits fixed-size chunks as segments are pushed."""
+        return MixStream(self, frame_rate, channels, dtype, chunk_frames)
+
+    def mix(self, segments: List[AudioSegment]) -> AudioSegment:
+        """Mix pydub segments into a single segment."""
+        if not segments:
+            raise ValueError("No audio segments provided")
+
+        synced, frame_rate, channels, sample_width = self._sync(segments)
+        mixed = self.mix_arrays(
+            [self.to_array(seg) for seg in synced],
+            frame_rate,
+            dtype=_SAMPLE_DTYPES[sample_width]
+        )
+        return AudioSegment(
+            data=mixed.tobytes(),
+            sample_width=sample_width,
+            frame_rate=frame_rate,
+            channels=channels
+        )
+
+
+class MixStream:
+    """
+    Incremental counterpart of ``AudioMixer.mix_arrays``.
+
+    Segments are pushed one at a time and mixed samples come out in ``chunk_frames``
+    sized arrays. Only the last crossfade-length of output is held back, because that is
+    the most a later join can still modify, so memory stays bounded by one segment plus
+    one chunk regardless of episode length.
+    """
+
+    def __init__(self, mixer: AudioMixer, frame_rate: int, channels: int, dtype, chunk_frames: int):
+        self.mixer = mixer
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.dtype = dtype
+        self.chunk_frames = chunk_frames
+        self._info = np.iinfo(dtype)
+        self._holdback = mixer.crossfade_duration * frame_rate // 1000
+        self._silence_frames = mixer.silence_duration * frame_rate // 1000
+        self._pending = None  # Mixed frames not yet emitted
+        self._total = 0  # Frames produced so far, emitted or pending
+
+    def push(self, array: np.ndarray) -> Iterator[np.ndarray]:
+        """Mix in the next (frames, channels) segment and yield every chunk that is final."""
+        if self._pending is None:
+            self._pending = array.astype(self.dtype, copy=True)
+            self._total = len(array)
+        else:
+            mixer, frame_rate, info = self.mixer, self.frame_rate, self._info
+
+            # Silence gap, fading out the tail of what we have so far
+            pending = self._pending
+            tail_fade = mixer._crossfade_frames(self._total, self._silence_frames, frame_rate)
+            mixer._apply_fade(pending, len(pending) - tail_fade, len(pending), frame_rate, False, info)
+            gap = self._silence_frames - tail_fade
+            self._total += gap
+            if gap:
+                pending = np.concatenate([pending, np.zeros((gap, self.channels), dtype=self.dtype)])
+
+            # Crossfade the segment head with the (partially silent) tail
+            crossfade = mixer._crossfade_frames(self._total, len(array), frame_rate)
+            if crossfade:
+                start = len(pending) - crossfade
+                mixer._apply_fade(pending, start, len(pending), frame_rate, False, info)
+                head = np.floor(
+                    array[:crossfade].astype(np.float64) * mixer._fade_curve(crossfade, frame_rate, True)
+                )
+                mixed = pending[start:].astype(np.float64) + head
+                pending[start:] = mixed.clip(info.min, info.max)
+
+            self._pending = np.concatenate([pending, array[crossfade:].astype(self.dtype, copy=False)])
+            self._total += len(array) - crossfade
+
+        # Everything before the hold-back window can no longer change
+        while len(self._pending) - self._holdback >= self.chunk_frames:
+            yield self._pending[:self.chunk_frames]
+            self._pending = self._pending[self.chunk_frames:]
+
+    def close(self) -> Iterator[np.ndarray]:
+        """Yield the remaining mixed frames."""
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        for start in range(0, len(pending), self.chunk_frames):
+            yield pending[start:start + self.chunk_frames]
@@ -0,0 +1,116 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+import io
+
+from pydub import AudioSegment
+
+from .encoder import encode_to_file
+from .loudness import LoudnessNormalizer
+from .mixer import AudioMixer
+from .utils import file_content_hash
+
+# Raw audio parts as returned by the model: (payload, mime type)
+AudioParts = List[Tuple[bytes, Optional[str]]]
+
+def decode_audio(audio_bytes: bytes, mime_type: Optional[str]) -> AudioSegment:
+    """
+    Decode audio returned by the model into an AudioSegment.
+
+    Args:
+        audio_bytes (bytes): Raw audio payload.
+        mime_type (Optional[str]): Mime type reported for the payload.
+
+    Returns:
+        AudioSegment: The decoded audio.
+    """
+    # Determine audio format from mime type
+    if mime_type == "audio/wav":
+        audio_stream = io.BytesIO(audio_bytes)
+        audio_segment = AudioSegment.from_file(audio_stream, format="wav")
+    elif mime_type == "audio/mp3":
+        audio_stream = io.BytesIO(audio_bytes)
+        audio_segment = AudioSegment.from_file(audio_stream, format="mp3")
+    elif mime_type and mime_type.startswith("audio/L16"):
+        # Handle raw PCM data (L16)
+        try:
+            # Extract rate parameter (e.g., from 'audio/L16;codec=pcm;rate=24000')
+            # Basic parsing, might need refinement for more complex mime strings
+            params = dict(p.split('=') for p in mime_type.split(';')[1:] if '=' in p)
+            rate = int(params.get('rate', 24000)) # Default to 24k if not found
+            sample_width = 2 # L16 means 16-bit = 2 bytes
+            channels = 1 # Assume mono
+
+            audio_segment = AudioSegment(
+                data=audio_bytes,
+                sample_width=sample_width,
+                frame_rate=rate,
+                channels=channels
+            )
+            print(f"Successfully parsed L16 audio with rate={rate}Hz")
+        except Exception as parse_err:
+            print(f"Error parsing L16 mime type '{mime_type}': {parse_err}")
+            # Fallback or raise error
+            raise ValueError(f"Could not parse L16 audio parameters from mime type: {mime_type}") from parse_err
+    else:
+        # Fallback for other unrecognized types - try letting pydub guess from stream
+        print(f"Warning: Unrecognized audio mime type '{mime_type}'. Attempting to load directly.")
+        try:
+            audio_stream = io.BytesIO(audio_bytes)
+            audio_segment = AudioSegment.from_file(audio_stream)
+        except Exception as load_err:
+            print(f"Error loading audio with unrecognized mime type '{mime_type}': {load_err}")
+            raise ValueError(f"Could not load audio data with mime type: {mime_type}") from load_err
+
+    return audio_segment
+
+def decode_parts(parts: AudioParts) -> AudioSegment:
+    """Decode the audio parts of one model response (or stream) into a single segment."""
+    if not parts:
+        raise ValueError("No audio generated")
+
+    # Raw PCM parts are slices of one stream; containers must be decoded one by one
+    mime_type = parts[0][1]
+    if mime_type and mime_type.startswith("audio/L16"):
+        return decode_audio(b"".join(data for data, _ in parts), mime_type)
+    return sum(
+        (decode_audio(data, part_mime) for data, part_mime in parts[1:]),
+        decode_audio(*parts[0])
+    )
+
+@lru_cache(maxsize=None)
+def _normalizer(true_peak_dbtp: float) -> LoudnessNormalizer:
+    # One per worker process; the target is passed per segment
+    return LoudnessNormalizer(true_peak_dbtp=true_peak_dbtp)
+
+@lru_cache(maxsize=None)
+def _chunk_mixer(crossfade_ms: int) -> AudioMixer:
+    return AudioMixer(crossfade_duration=crossfade_ms, silence_duration=0)
+
+def process_segment(chunks: List[AudioParts], path: Path, format: str, bitrate: int,
+                    target_lufs: float, true_peak_dbtp: float, crossfade_ms: int) -> Tuple[bool, Tuple[float, str]]:
+    """
+    Turn raw model output into a finished segment file: decode, stitch, normalize, encode.
+
+    This is the CPU-bound half of segment generation. It takes only the compressed or raw
+    PCM bytes the model returned and writes the result straight to ``path``, so when run
+    in a worker process nothing larger than the model payload crosses the process boundary.
+
+    Args:
+        chunks: Audio parts per synthesized chunk; several chunks are crossfaded together.
+        path: Output file path.
+        format: Output format.
+        bitrate: Encoder bitrate in kbps.
+        target_lufs: Integrated loudness target.
+        true_peak_dbtp: True-peak ceiling.
+        crossfade_ms: Crossfade between chunks of a split turn.
+
+    Returns:
+        Tuple[bool, Tuple[float, str]]: Whether the in-process encoder was used, and the
+            duration in seconds with the content hash of the written file.
+    """
+    segments = [decode_parts(parts) for parts in chunks]
+    audio = segments[0] if len(segments) == 1 else _chunk_mixer(crossfade_ms).mix(segments)
+    audio = _normalizer(true_peak_dbtp).normalize_segments([audio], [target_lufs])[0]
+    used_in_process = encode_to_file(audio, path, format, bitrate)
+    return used_in_process, (audio.duration_seconds, file_content_hash(path))
@@ -3,28 +3,31 @@ from pydub import AudioSegment
 from typing import List, Tuple, Optional
 import os
 
+from app.core.config import settings
+from .encoder import encode_to_file
+from .loudness import LoudnessNormalizer
+from .mixer import AudioMixer
+
 class AudioProcessor:
     def __init__(self):
         self.crossfade_duration = 1000  # milliseconds
         self.silence_duration = 500  # milliseconds
         self.background_music_volume = -20  # dB
+        self.normalizer = LoudnessNormalizer(
+            target_lufs=settings.LOUDNESS_TARGET_LUFS,
+            true_peak_dbtp=settings.TRUE_PEAK_DBTP
+        )
 
     def combine_segments(self, segments: List[Tuple[AudioSegment, str]]) -> AudioSegment:
         """Combine multiple audio segments with crossfading and silence."""
         if not segments:
             raise ValueError("No audio segments provided")
-            
-        combined = segments[0][0]
-        
-        for next_segment, _ in segments[1:]:
-            # Add silence between segments
-            silence = AudioSegment.silent(duration=self.silence_duration)
-            combined = combined.append(silence, crossfade=self.crossfade_duration)
-            
-            # Add next segment
-            combined = combined.append(next_segment, crossfade=self.crossfade_duration)
-        
-        return combined
+
+        mixer = AudioMixer(
+            crossfade_duration=self.crossfade_duration,
+            silence_duration=self.silence_duration
+        )
+        return mixer.mix([segment for segment, _ in segments])
 
     def save_audio(self, audio: AudioSegment, filepath: Path, format: str = "wav") -> str:
         """Save the audio segment to a file and return the path."""
@@ -32,11 +35,15 @@ class AudioProcessor:
         output_path = Path(filepath) 
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Export expects a string path and uses the provided format
-        audio.export(str(output_path), format=format)
+        # Encodes in-process where possible instead of spawning ffmpeg
+        encode_to_file(audio, output_path, format=format)
         return str(output_path)
 
-    def normalize_audio(self, audio: AudioSegment, target_db: float = -20.0) -> AudioSegment:
-        """Normalize audio to a target dB level."""
-        difference = target_db - audio.dBFS
-        return audio.apply_gain(difference) 
\ No newline at end of file
+    def normalize_audio(self, audio: AudioSegment, target_lufs: Optional[float] = None) -> AudioSegment:
+        """Normalize audio to a target integrated loudness (LUFS) under a true-peak ceiling."""
+        return self.normalizer.normalize_segments([audio], [target_lufs])[0]
+
+    def normalize_segments(self, segments: List[AudioSegment],
+                           targets: Optional[List[Optional[float]]] = None) -> List[AudioSegment]:
+        """Normalize many segments, e.g. a whole episode, in one batched pass."""
+        return self.normalizer.normalize_segments(segments, targets)
@@ -0,0 +1,150 @@
+from pathlib import Path
+from typing import AsyncIterator, List
+import asyncio
+import hashlib
+import json
+import os
+import secrets
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import get_encoder_name
+
+from app.core.config import settings
+from .mixer import AudioMixer
+
+class EpisodeRenderer:
+    """
+    Render finished segments into a single episode file with bounded memory.
+
+    Segments are decoded one at a time, pushed through an incremental ``AudioMixer``
+    stream and piped as raw PCM into a single ffmpeg encoder process. Encoded bytes are
+    written to disk and handed back to the caller as they are produced, so the episode
+    never exists in memory as a whole.
+    """
+
+    def __init__(self, root_dir: Path, episodes_dir: Path, mixer: AudioMixer):
+        self.root_dir = Path(root_dir)
+        self.episodes_dir = Path(episodes_dir)
+        self.mixer = mixer
+        self.frame_rate = settings.EPISODE_FRAME_RATE
+        self.channels = 1
+        self.sample_width = 2  # 16-bit PCM
+
+        self.episodes_dir.mkdir(parents=True, exist_ok=True)
+
+    def resolve_segments(self, segment_paths: List[str]) -> List[Path]:
+        """
+        Resolve segment paths relative to the audio root.
+
+        Raises:
+            ValueError: If a path escapes the audio root or does not exist
+        """
+        root = self.root_dir.resolve()
+        resolved = []
+        for segment_path in segment_paths:
+            path = (root / segment_path).resolve()
+            if root not in path.parents:
+                raise ValueError(f"Invalid segment path: {segment_path}")
+            if not path.is_file():
+                raise ValueError(f"Segment not found: {segment_path}")
+            resolved.append(path)
+        return resolved
+
+    def episode_path(self, segments: List[Path]) -> Path:
+        """
+        Output path for the episode mixed from ``segments``.
+
+        The name hashes the segment files (which are named by content) and every mixing
+        and encoding setting, so it is known before rendering starts, a name always denotes
+        the same audio, and an episode that was rendered before can be reused.
+        """
+        root = self.root_dir.resolve()
+        payload = json.dumps([
+            [Path(segment).resolve().relative_to(root).as_posix() for segment in segments],
+            self.mixer.crossfade_duration, self.mixer.silence_duration,
+            self.frame_rate, self.channels, settings.EPISODE_BITRATE
+        ])
+        return self.episodes_dir / f"{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]}.mp3"
+
+    def relative_path(self, path: Path) -> str:
+        """Path of an episode file relative to the audio root, as served under /audio."""
+        return Path(path).relative_to(self.root_dir).as_posix()
+
+    def _load_segment(self, path: Path) -> np.ndarray:
+        """Decode one segment into episode-format (frames, channels) int16 samples."""
+        segment = (
+            AudioSegment.from_file(str(path))
+            .set_frame_rate(self.frame_rate)
+            .set_channels(self.channels)
+            .set_sample_width(self.sample_width)
+        )
+        return AudioMixer.to_array(segment)
+
+    def _encoder_command(self) -> List[str]:
+        return [
+            get_encoder_name(),
+            "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(self.frame_rate), "-ac", str(self.channels),
+            "-i", "pipe:0",
+            "-b:a", settings.EPISODE_BITRATE,
+            "-f", "mp3", "pipe:1"
+        ]
+
+    async def render(self, segments: List[Path], output_path: Path) -> AsyncIterator[bytes]:
+        """
+        Mix and encode ``segments`` into ``output_path``, yielding encoded bytes as they arrive.
+
+        The file only appears at ``output_path`` once encoding finished successfully.
+        """
+        encoder = await asyncio.create_subprocess_exec(
+            *self._encoder_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        # Unique temporary name, as identical episodes may be rendered concurrently
+        temp_path = output_path.with_name(f"{output_path.name}.{secrets.token_hex(8)}.tmp")
+
+        async def feed_encoder():
+            try:
+                stream = self.mixer.stream(
+                    self.frame_rate, self.channels, np.int16, chunk_frames=settings.EPISODE_CHUNK_FRAMES
+                )
+                for path in segments:
+                    # Decoding shells out to ffmpeg; keep it off the event loop
+                    samples = await asyncio.to_thread(self._load_segment, path)
+                    for chunk in stream.push(samples):
+                        encoder.stdin.write(chunk.tobytes())
+                        await encoder.stdin.drain()
+                for chunk in stream.close():
+                    encoder.stdin.write(chunk.tobytes())
+                    await encoder.stdin.drain()
+            finally:
+                encoder.stdin.close()
+
+        feeder = asyncio.ensure_future(feed_encoder())
+        try:
+            with open(temp_path, "wb") as f:
+                while True:
+                    data = await encoder.stdout.read(65536)
+                    if not data:
+                        break
+                    f.write(data)
+                    yield data
+
+            # An encoder failure also breaks the feeder's pipe, so report it first
+            if await encoder.wait() != 0:
+                error = (await encoder.stderr.read()).decode(errors="replace").strip()
+                raise RuntimeError(f"Episode encoding failed: {error}")
+            await feeder
+
+            os.replace(temp_path, output_path)
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            if encoder.returncode is None:
+                encoder.kill()
+                await encoder.wait()
+            if temp_path.exists():
+                temp_path.unlink()
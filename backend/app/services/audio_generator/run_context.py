@@ -0,0 +1,40 @@
+from pathlib import Path
+from typing import Optional
+import hashlib
+import os
+
+from .utils import generate_unique_run_id
+
+def shard_path(base_dir: Path, name: str) -> Path:
+    """
+    Directory for ``name`` under two levels of hash-prefix shards (``ab/cd/``).
+
+    Spreading files over up to 65536 directories keeps every directory small, so
+    lookups and listings stay fast however many files there are in total.
+    """
+    digest = hashlib.sha256(name.encode("utf-8")).hexdigest()
+    return Path(base_dir) / digest[:2] / digest[2:4]
+
+class RunContext:
+    """
+    Per-request state of one generation run: its id and where its files go.
+
+    Each run writes its segments to its own directory, ``<segments_dir>/<shard>/<run_id>/``,
+    so concurrent requests never share names and no directory grows without bound. Segment
+    files are named by their content hash.
+    """
+
+    def __init__(self, segments_dir: Path, run_id: Optional[str] = None):
+        self.run_id = run_id or generate_unique_run_id()
+        self.segments_dir = shard_path(segments_dir, self.run_id) / self.run_id
+
+    def prepare_dir(self) -> Path:
+        """Create the run's segment directory and return it."""
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        # Fresh modification time so storage GC does not remove the directory while it is empty
+        os.utime(self.segments_dir)
+        return self.segments_dir
+
+    def segment_path(self, content_hash: str, output_format: str) -> Path:
+        """Path of the segment file of this run with the given contents."""
+        return self.segments_dir / f"{content_hash}.{output_format}"
@@ -0,0 +1,228 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+
+class StorageManager:
+    """
+    Quota enforcement and garbage collection for generated audio files.
+
+    Files anywhere below ``managed_dirs`` (per-run segments and rendered episodes), except
+    in ``excluded_dirs`` (the segment cache, which has its own budget), are owned by the
+    runs whose manifests reference them. When usage exceeds ``max_bytes`` or ``max_files``,
+    unreferenced files are deleted least recently modified first. Manifests of runs idle
+    for longer than ``run_retention_seconds`` are removed, releasing their segments. Files
+    younger than ``min_age_seconds`` are never deleted, so audio that is still being
+    written or was just handed to a client stays available.
+
+    Collection scans the disk in a worker thread, from a background task that runs every
+    ``interval_seconds`` and early when writes push usage over quota.
+    """
+
+    def __init__(self, root_dir: Path, managed_dirs: List[Path], runs_dir: Path,
+                 max_bytes: int, max_files: int, interval_seconds: float,
+                 min_age_seconds: float, run_retention_seconds: float,
+                 excluded_dirs: Optional[List[Path]] = None):
+        self.root_dir = Path(root_dir)
+        self.managed_dirs = [Path(directory) for directory in managed_dirs]
+        self.excluded_dirs = {os.path.normpath(directory) for directory in excluded_dirs or []}
+        self.runs_dir = Path(runs_dir)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.interval_seconds = interval_seconds
+        self.min_age_seconds = min_age_seconds
+        self.run_retention_seconds = run_retention_seconds
+
+        # Usage as of the last collection plus writes noted since
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._files = 0
+        self._referenced = (0, 0, 0)  # bytes, files, runs
+        self._last_collection: Dict[str, Any] = {}
+        self.collections = 0
+        self.deleted_files = 0
+        self.deleted_bytes = 0
+        self.deleted_runs = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the background collector if it is not running yet."""
+        # Started from the app lifespan so the task and event bind to the serving event loop
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background collector."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def note_write(self, path: Path) -> None:
+        """Account for a newly written file and collect early if it takes usage over quota."""
+        try:
+            size = Path(path).stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            self._bytes += size
+            self._files += 1
+            over_quota = self._bytes > self.max_bytes or self._files > self.max_files
+
+        if over_quota and self._wake is not None:
+            self._wake.set()
+
+    async def collect(self) -> Dict[str, Any]:
+        """Run one collection without blocking the event loop."""
+        return await asyncio.to_thread(self._collect)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.collect()
+            except Exception as e:
+                print(f"Storage collection failed: {e}")
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def _references(self, now: float) -> Tuple[Dict[str, str], int]:
+        """
+        Map every file referenced by a retained run manifest to its run id,
+        deleting the manifests of expired runs.
+
+        Returns:
+            Tuple[Dict[str, str], int]: Owning run id by relative path, and the number of runs removed
+        """
+        owners: Dict[str, str] = {}
+        removed = 0
+        if not self.runs_dir.is_dir():
+            return owners, removed
+
+        for entry in os.scandir(self.runs_dir):
+            if not entry.is_dir():
+                continue
+            manifest_path = Path(entry.path) / "manifest.json"
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                # Missing or half-written manifest; judge the run by its directory age
+                manifest = {"updatedAt": entry.stat().st_mtime, "segments": {}}
+
+            if now - manifest.get("updatedAt", 0) > self.run_retention_seconds:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+                continue
+
+            for segment in manifest.get("segments", {}).values():
+                if segment.get("path"):
+                    owners[segment["path"]] = entry.name
+        return owners, removed
+
+    def _collect(self) -> Dict[str, Any]:
+        """Scan managed files, evict unreferenced ones while over quota, and record usage."""
+        started = time.monotonic()
+        now = time.time()
+        owners, removed_runs = self._references(now)
+
+        # (mtime, path, size) of files that may be evicted, and running totals
+        candidates: List[Tuple[float, str, int]] = []
+        total_bytes = total_files = 0
+        referenced_bytes = referenced_files = 0
+        empty_dirs: List[str] = []
+        for managed_dir in self.managed_dirs:
+            for directory, subdirs, filenames in os.walk(managed_dir, topdown=True):
+                subdirs[:] = [
+                    name for name in subdirs
+                    if os.path.normpath(os.path.join(directory, name)) not in self.excluded_dirs
+                ]
+                if not subdirs and not filenames and directory != str(managed_dir):
+                    if now - os.stat(directory).st_mtime >= self.min_age_seconds:
+                        empty_dirs.append(directory)
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    total_bytes += stat.st_size
+                    total_files += 1
+                    relative = Path(path).relative_to(self.root_dir).as_posix()
+                    if relative in owners:
+                        referenced_bytes += stat.st_size
+                        referenced_files += 1
+                    elif now - stat.st_mtime >= self.min_age_seconds:
+                        candidates.append((stat.st_mtime, path, stat.st_size))
+
+        deleted_files = deleted_bytes = 0
+        candidates.sort()
+        for _, path, size in candidates:
+            if total_bytes <= self.max_bytes and total_files <= self.max_files:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            total_files -= 1
+            deleted_bytes += size
+            deleted_files += 1
+
+        # Drop run directories emptied by earlier collections
+        for directory in empty_dirs:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+        result = {
+            "finished_at": now,
+            "duration_seconds": time.monotonic() - started,
+            "deleted_files": deleted_files,
+            "deleted_bytes": deleted_bytes,
+            "deleted_runs": removed_runs
+        }
+        with self._lock:
+            self._bytes = total_bytes
+            self._files = total_files
+            self._referenced = (referenced_bytes, referenced_files, len(set(owners.values())))
+            self._last_collection = result
+            self.collections += 1
+            self.deleted_files += deleted_files
+            self.deleted_bytes += deleted_bytes
+            self.deleted_runs += removed_runs
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage as of the last collection (plus later writes) and GC counters."""
+        with self._lock:
+            referenced_bytes, referenced_files, runs = self._referenced
+            return {
+                "bytes": self._bytes,
+                "files": self._files,
+                "max_bytes": self.max_bytes,
+                "max_files": self.max_files,
+                "referenced_bytes": referenced_bytes,
+                "referenced_files": referenced_files,
+                "runs": runs,
+                "collections": self.collections,
+                "deleted_files": self.deleted_files,
+                "deleted_bytes": self.deleted_bytes,
+                "deleted_runs": self.deleted_runs,
+                "last_collection": self._last_collection or None,
+                "running": self._task is not None and not self._task.done()
+            }
@@ -1,6 +1,9 @@
 from datetime import datetime
+import hashlib
 import random
-from typing import List
+import re
+import secrets
+from typing import List, Tuple
 
 # Word lists for generating unique folder names
 ADJECTIVES: List[str] = [
@@ -51,8 +54,11 @@ def generate_unique_run_id() -> str:
     """
     Generate a unique run ID using random adjective and noun combinations.
     
+    The readable words and timestamp alone repeat under concurrency, so a 64-bit random
+    suffix makes the id collision-free.
+    
     Returns:
-        str: A unique identifier in the format 'adj1-adj2-noun-timestamp'
+        str: A unique identifier in the format 'adj1-adj2-noun-timestamp-suffix'
     """
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     
@@ -63,7 +69,7 @@ def generate_unique_run_id() -> str:
     selected_noun = random.choice(NOUNS)
     
     # Combine into a unique identifier
-    return f"{selected_adjectives[0]}-{selected_adjectives[1]}-{selected_noun}-{timestamp}"
+    return f"{selected_adjectives[0]}-{selected_adjectives[1]}-{selected_noun}-{timestamp}-{secrets.token_hex(8)}"
 
 def format_duration(milliseconds: int) -> str:
     """
@@ -111,15 +117,19 @@ def chunk_text(text: str, max_length: int = 5000) -> List[str]:
     """
     Split long text into smaller chunks while preserving sentence boundaries.
     
+    Sentences keep their original terminal punctuation so questions and exclamations
+    are still voiced as such once chunks are synthesized separately.
+    
     Args:
         text: Input text to chunk
-        max_length: Maximum length of each chunk
+        max_length: Maximum length of each chunk (a single longer sentence becomes its own chunk)
         
     Returns:
         List[str]: List of text chunks
     """
-    # Split into sentences (basic implementation)
-    sentences = text.replace('!', '.').replace('?', '.').split('.')
+    # Split into sentences, keeping the punctuation that ends each one
+    # (punctuation only ends a sentence when followed by whitespace, so "3.5" stays intact)
+    sentences = re.findall(r'.+?(?:[.!?]+(?=\s|$)|$)', text, re.DOTALL)
     
     chunks = []
     current_chunk = []
@@ -130,8 +140,6 @@ def chunk_text(text: str, max_length: int = 5000) -> List[str]:
         if not sentence:
             continue
             
-        # Add period back to sentence
-        sentence = sentence + '.'
         sentence_length = len(sentence)
         
         if current_length + sentence_length > max_length and current_chunk:
@@ -150,6 +158,80 @@ def chunk_text(text: str, max_length: int = 5000) -> List[str]:
     
     return chunks
 
+def group_turns(
+    turns: List[Tuple[int, str, str]],
+    max_chars: int,
+    max_turns: int,
+    turn_max_chars: int,
+    max_speakers: int = 2
+) -> List[List[Tuple[int, str, str]]]:
+    """
+    Group consecutive short turns into batches for multi-speaker synthesis.
+    
+    A batch only holds turns with adjacent indices, at most ``max_speakers`` distinct
+    speakers, ``max_turns`` turns and ``max_chars`` characters of text. Turns longer
+    than ``turn_max_chars`` always form a batch of their own.
+    
+    Args:
+        turns: (index, speaker, text) tuples in transcript order
+        max_chars: Maximum total text length of a batch
+        max_turns: Maximum number of turns in a batch
+        turn_max_chars: Maximum length of a turn that may share a batch
+        max_speakers: Maximum number of distinct speakers in a batch
+        
+    Returns:
+        List[List[Tuple[int, str, str]]]: Batches of turns, in order
+    """
+    batches = []
+    current: List[Tuple[int, str, str]] = []
+    speakers = set()
+    length = 0
+    
+    for turn in turns:
+        index, speaker, text = turn
+        batchable = len(text) <= turn_max_chars
+        
+        fits = (
+            batchable
+            and current
+            and index == current[-1][0] + 1
+            and len(current) < max_turns
+            and length + len(text) <= max_chars
+            and len(speakers | {speaker}) <= max_speakers
+        )
+        if current and not fits:
+            batches.append(current)
+            current, speakers, length = [], set(), 0
+        
+        if not batchable:
+            batches.append([turn])
+            continue
+        
+        current.append(turn)
+        speakers.add(speaker)
+        length += len(text)
+    
+    if current:
+        batches.append(current)
+    
+    return batches
+
+def file_content_hash(path) -> str:
+    """
+    Hash a file's contents for use as its name.
+    
+    Args:
+        path: File to hash
+        
+    Returns:
+        str: 32 hex characters (128 bits) of the file's SHA-256
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
 def get_file_size_str(size_in_bytes: int) -> str:
     """
     Convert file size in bytes to human-readable string.
@@ -0,0 +1,55 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+
+class EventLog:
+    """
+    Append-only log of events that any number of subscribers can replay and follow.
+
+    Event ids are 1-based positions in the log, so a subscriber that has seen id ``n``
+    resumes with ``subscribe(after=n)``.
+    """
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._changed: Optional[asyncio.Event] = None
+        self.closed = False
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def last_event_id(self) -> int:
+        return len(self._events)
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Add an event and wake subscribers. Returns the event id."""
+        if self.closed:
+            raise RuntimeError("Event log is closed")
+        self._events.append(event)
+        self._wake()
+        return len(self._events)
+
+    def close(self) -> None:
+        """Mark the log as complete; subscribers finish once they have caught up."""
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def subscribe(self, after: int = 0) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Yield ``(event_id, event)`` for every event after ``after``, then follow live events."""
+        position = max(0, after)
+        while True:
+            while position < len(self._events):
+                position += 1
+                yield position, self._events[position - 1]
+
+            if self.closed:
+                return
+
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            await self._changed.wait()
@@ -0,0 +1,41 @@
+from typing import Optional
+import threading
+
+import httpx
+from google import genai
+from google.genai.types import HttpOptions
+
+from app.core.config import settings
+
+_client: Optional[genai.Client] = None
+_client_lock = threading.Lock()
+
+def _connection_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.GEMINI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.GEMINI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.GEMINI_KEEPALIVE_EXPIRY
+    )
+
+def get_gemini_client() -> genai.Client:
+    """
+    Return the process-wide Gemini client, creating it on first use.
+
+    Every service shares this client and therefore its pooled HTTP connections, so
+    keep-alive connections are reused across audio, transcript and voice config calls
+    and nothing connects or authenticates at import time.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = genai.Client(
+                    project=settings.PROJECT_ID,
+                    location=settings.GEMINI_LOCATION,
+                    vertexai=True,
+                    http_options=HttpOptions(
+                        client_args={"limits": _connection_limits()},
+                        async_client_args={"limits": _connection_limits()}
+                    )
+                )
+    return _client
@@ -0,0 +1,150 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+import time
+import uuid
+
+from app.core.config import settings
+from app.services.event_log import EventLog
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+class Job:
+    """A unit of background work whose progress events are recorded in an ``EventLog``."""
+
+    def __init__(self, kind: str, run: Callable[[], AsyncIterator[Dict[str, Any]]]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.events = EventLog()
+        self._run = run
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "error": self.error,
+            "result": self.result,
+            "lastEventId": self.events.last_event_id
+        }
+
+class JobManager:
+    """
+    Bounded background job queue consumed by a fixed pool of workers.
+
+    Jobs run independently of the HTTP request that submitted them; clients follow them
+    through the job's event log and can reconnect at any point. Finished jobs are kept
+    for ``retention_seconds`` so late reconnects can still replay their events.
+    """
+
+    def __init__(self, workers: int, max_queue: int, retention_seconds: float):
+        self.worker_count = workers
+        self.max_queue = max_queue
+        self.retention_seconds = retention_seconds
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        # Started lazily so the queue and workers bind to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._workers = [
+                asyncio.ensure_future(self._worker()) for _ in range(self.worker_count)
+            ]
+        return self._queue
+
+    def submit(self, kind: str, run: Callable[[], AsyncIterator[Dict[str, Any]]]) -> Job:
+        """
+        Queue a job whose ``run`` factory produces its progress events.
+
+        Raises:
+            JobQueueFull: If the queue is at capacity
+        """
+        queue = self._ensure_workers()
+        self._prune()
+
+        job = Job(kind, run)
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"Job queue is full ({self.max_queue} jobs waiting)")
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget finished jobs past their retention period."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            async for event in job._run():
+                if event.get("type") == "audio_chunk":
+                    continue  # Live audio is not replayable; only progress and file paths are kept
+                job.events.append(event)
+                if event.get("type") == "complete":
+                    job.result = event
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            job.events.append({
+                "type": "error",
+                "stage": "generation_failed",
+                "error": str(e)
+            })
+        finally:
+            job.finished_at = time.time()
+            job.events.close()
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.worker_count,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": counts
+        }
+
+job_manager = JobManager(
+    workers=settings.JOB_WORKERS,
+    max_queue=settings.JOB_QUEUE_SIZE,
+    retention_seconds=settings.JOB_RETENTION_SECONDS
+)
@@ -0,0 +1,242 @@
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import random
+import time
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying: throttling and transient server errors
+THROTTLED_CODES = {429}
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+def _error_code(error: BaseException) -> Optional[int]:
+    """Extract an HTTP-like status code from an SDK or transport error, if any."""
+    for attribute in ("code", "status_code"):
+        code = getattr(error, attribute, None)
+        if isinstance(code, int):
+            return code
+    if "RESOURCE_EXHAUSTED" in str(error):
+        return 429
+    return None
+
+class TokenBucket:
+    """Async token bucket allowing ``rate`` calls per second with bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting for the bucket to refill if necessary.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0  # Unlimited
+
+        # Created lazily so it binds to the running event loop rather than the import-time one
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    @property
+    def tokens(self) -> float:
+        return min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency controller.
+
+    The in-flight limit grows additively (about +1 per limit's worth of successful calls)
+    and is cut multiplicatively when a call is throttled. Decreases are rate-limited by a
+    cooldown so one burst of 429s only halves the limit once.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int,
+                 backoff: float = 0.5, cooldown: float = 1.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop rather than the import-time one
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> None:
+        """Wait until a slot under the current limit is free and take it."""
+        condition = self._get_condition()
+        async with condition:
+            while self.in_flight >= int(self.limit):
+                await condition.wait()
+            self.in_flight += 1
+
+    async def release(self, throttled: bool = False, succeeded: bool = True) -> None:
+        """Return a slot and adapt the limit to the call's outcome."""
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(float(self.minimum), self.limit * self.backoff)
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif succeeded and self.limit < self.maximum:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+                self.increases += 1
+            condition.notify_all()
+
+class GeminiRateLimiter:
+    """
+    Shared admission control for every Gemini call.
+
+    Each call takes a token from a ``TokenBucket`` and a slot from an
+    ``AdaptiveConcurrencyLimiter``. ``call`` retries throttled (429) and transient 5xx
+    failures with exponential backoff and full jitter. ``slot`` and ``retry_delay`` are
+    for calls that can only be retried up to a point, such as streams that may already
+    have forwarded data.
+    """
+
+    def __init__(self, bucket: TokenBucket, concurrency: AdaptiveConcurrencyLimiter,
+                 max_retries: int = 4, base_delay: float = 0.5, max_delay: float = 20.0):
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        # Metrics
+        self.calls = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.retries = 0
+        self.failures = 0
+        self.rate_wait_seconds = 0.0
+
+    def _record_error(self, error: BaseException) -> Optional[int]:
+        code = _error_code(error)
+        if code in THROTTLED_CODES:
+            self.throttled += 1
+        elif code is not None and code >= 500:
+            self.server_errors += 1
+        return code
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a rate token and concurrency slot for the duration of the block."""
+        self.rate_wait_seconds += await self.bucket.acquire()
+        await self.concurrency.acquire()
+        self.calls += 1
+        throttled = False
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        except BaseException as e:
+            throttled = self._record_error(e) in THROTTLED_CODES
+            raise
+        finally:
+            await self.concurrency.release(throttled=throttled, succeeded=succeeded)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` under the limiter, retrying throttled and transient failures.
+
+        Args:
+            fn: Zero-argument coroutine factory performing one model call
+
+        Returns:
+            The result of ``fn``
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.slot():
+                    return await fn()
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """
+        Decide whether a failed call should be retried, for callers running their own retry loop.
+
+        Args:
+            error: The error the call failed with
+            attempt: Number of retries already made
+
+        Returns:
+            Optional[float]: Seconds to back off before retrying, or None if ``error`` is
+                not retryable or the retries are exhausted
+        """
+        if _error_code(error) not in RETRYABLE_CODES or attempt >= self.max_retries:
+            self.failures += 1
+            return None
+
+        # Exponential backoff with full jitter
+        self.retries += 1
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current limits and rejection counters."""
+        return {
+            "rate_per_second": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "tokens_available": round(self.bucket.tokens, 2),
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "concurrency_min": self.concurrency.minimum,
+            "concurrency_max": self.concurrency.maximum,
+            "in_flight": self.concurrency.in_flight,
+            "limit_increases": self.concurrency.increases,
+            "limit_decreases": self.concurrency.decreases,
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rate_wait_seconds": round(self.rate_wait_seconds, 3)
+        }
+
+# Shared by every service that calls Gemini
+gemini_limiter = GeminiRateLimiter(
+    bucket=TokenBucket(rate=settings.GEMINI_RATE_PER_SECOND, capacity=settings.GEMINI_BURST),
+    concurrency=AdaptiveConcurrencyLimiter(
+        initial=settings.GEMINI_CONCURRENCY_INITIAL,
+        minimum=settings.GEMINI_CONCURRENCY_MIN,
+        maximum=settings.GEMINI_CONCURRENCY_MAX
+    ),
+    max_retries=settings.GEMINI_MAX_RETRIES,
+    base_delay=settings.GEMINI_RETRY_BASE_DELAY,
+    max_delay=settings.GEMINI_RETRY_MAX_DELAY
+)
@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import time
+
+def make_request_key(kind: str, payload: Dict[str, Any]) -> str:
+    """
+    Hash a request into a cache key after normalizing it.
+
+    Strings are stripped and runs of whitespace within a line collapsed (line breaks are
+    kept, since they separate transcript turns), so requests that differ only in
+    incidental spacing share a key.
+    """
+    def normalize(value):
+        if isinstance(value, str):
+            return "\n".join(" ".join(line.split()) for line in value.splitlines() if line.strip())
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+
+    encoded = json.dumps([kind, normalize(payload)], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class CoalescingCache:
+    """
+    Coalesces identical in-flight requests and caches their results for a while.
+
+    Concurrent callers with the same key share one computation, which runs as its own
+    task so a caller that goes away does not cancel it for the others. Successful results
+    are kept for ``ttl_seconds`` within a ``max_bytes`` budget (least recently used
+    entries are evicted first); failures are never cached. A TTL of 0 disables the
+    result cache but still coalesces. Callers that ask for a fresh result bypass both.
+    """
+
+    def __init__(self, ttl_seconds: float, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+        # key -> (expires at, size in bytes, result), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                             use_cache: bool = True) -> Any:
+        """
+        Return the cached result for ``key``, join an identical in-flight call, or run ``compute``.
+
+        With ``use_cache`` off, ``compute`` always runs on its own and its result is not
+        cached, like the audio segment cache's ``useCache`` flag.
+        """
+        if not use_cache:
+            self.bypassed += 1
+            return await compute()
+
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._on_done(key, done))
+
+        result = await asyncio.shield(task)
+        return dict(result) if isinstance(result, dict) else result
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, result = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return dict(result) if isinstance(result, dict) else result
+
+    def _on_done(self, key: str, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self.ttl_seconds <= 0:
+            return
+
+        result = task.result()
+        size = len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, size, result)
+        self._total_bytes += size
+        while self._total_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "bypassed": self.bypassed
+        }
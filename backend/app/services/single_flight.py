@@ -0,0 +1,57 @@
+from typing import Any, AsyncIterator, Callable, Dict
+import asyncio
+
+from app.services.event_log import EventLog
+
+class SingleFlight:
+    """
+    Runs at most one event-producing operation per key at a time.
+
+    The first caller for a key starts the operation as an independent task recording its
+    events in an ``EventLog``; concurrent callers with the same key attach to that log and
+    receive every event from the beginning, so duplicates cost nothing extra. The flight
+    is forgotten once it finishes.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, EventLog] = {}
+        self.started = 0
+        self.joined = 0
+
+    def subscribe(self, key: str, start: Callable[[], AsyncIterator[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+        """Return the events of the in-flight operation for ``key``, starting it with ``start`` if needed."""
+        log = self._flights.get(key)
+        if log is None:
+            log = EventLog()
+            self._flights[key] = log
+            self.started += 1
+            asyncio.ensure_future(self._run(key, log, start()))
+        else:
+            self.joined += 1
+        return self._follow(log)
+
+    @staticmethod
+    async def _follow(log: EventLog) -> AsyncIterator[Dict[str, Any]]:
+        async for _, event in log.subscribe():
+            yield event
+
+    async def _run(self, key: str, log: EventLog, events: AsyncIterator[Dict[str, Any]]) -> None:
+        try:
+            async for event in events:
+                log.append(event)
+        except Exception as e:
+            log.append({
+                "type": "error",
+                "stage": "generation_failed",
+                "error": str(e)
+            })
+        finally:
+            del self._flights[key]
+            log.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "joined": self.joined
+        }
@@ -1,31 +1,42 @@
-from typing import Dict, Any
-from google import genai
+from typing import Dict, Any, AsyncIterator, Tuple
 from google.genai.types import Content, GenerateContentConfig, Part
 from fastapi import HTTPException
+import asyncio
 import re
 import uuid
 import os
 
 from app.core.config import settings
 from app.core.models import ConceptRequest, TranscriptEditRequest, TranscriptExtendRequest
+from app.services.gemini_client import get_gemini_client
+from app.services.rate_limiter import gemini_limiter
+from app.services.result_cache import CoalescingCache, make_request_key
+from app.services.transcript_parser import parse_transcript
 from .prompts import PromptGenerator
-from .validator import TranscriptValidator
+from .validator import TranscriptValidator, StreamingTranscriptValidator
 
 # Add a constant for WPM
 WORDS_PER_MINUTE = 150
 TRANSCRIPT_DIR = "generated_transcripts" # Define storage directory
+TRANSCRIPT_MODEL = "gemini-2.0-flash-001"
+
+# Shared by every TranscriptGenerator so duplicate requests coalesce process-wide
+transcript_cache = CoalescingCache(
+    ttl_seconds=settings.TRANSCRIPT_CACHE_TTL_SECONDS,
+    max_bytes=settings.TRANSCRIPT_CACHE_MAX_BYTES
+)
 
 class TranscriptGenerator:
     def __init__(self):
-        """Initialize the TranscriptGenerator with Gemini client."""
-        self.client = genai.Client(
-            project=settings.PROJECT_ID,
-            location="us-central1",
-            vertexai=True
-        )
+        """Initialize the TranscriptGenerator; the Gemini client is shared and created lazily."""
         self.validator = TranscriptValidator()
         self.max_retries = 2 # Define max retries for generation
 
+    @property
+    def client(self):
+        """The shared Gemini client, created on first use."""
+        return get_gemini_client()
+
     async def generate(self, request: ConceptRequest) -> Dict[str, Any]:
         """
         Generate a podcast transcript based on the concept request, with validation retries.
@@ -39,25 +50,16 @@ class TranscriptGenerator:
         Raises:
             HTTPException: If generation or validation fails after retries
         """
-        if len(request.character_names) != request.num_speakers:
-            raise HTTPException(status_code=400, detail="Number of speakers must match number of character names")
-
-        # --- Clean Character Names --- 
-        # Strip whitespace from character names before using them
-        cleaned_character_names = [name.strip() for name in request.character_names]
-        # Update the request object in place (if mutable) or create a new one if needed.
-        # Assuming request object allows modification for simplicity. If not, adjust accordingly.
-        request.character_names = cleaned_character_names 
-        # --- End Clean Character Names ---
-
-        base_prompt_text = PromptGenerator.create_podcast_prompt(request)
-        initial_enhancement = (
-            "\n\nIMPORTANT INSTRUCTION: Ensure that the generated transcript includes dialogue "
-            # Use cleaned names in the prompt enhancement as well
-            f"from ALL of the following characters: {', '.join(request.character_names)}. " 
-            "Each character should have at least one speaking line."
+        # Identical concurrent requests share one generation; recent results are reused
+        # unless the caller asks for a fresh transcript
+        key = make_request_key("generate", request.dict(exclude={"useCache"}))
+        return await transcript_cache.get_or_compute(
+            key, lambda: self._generate(request), use_cache=request.useCache
         )
-        
+
+    async def _generate(self, request: ConceptRequest) -> Dict[str, Any]:
+        """Run the generation and validation retry loop for ``generate``."""
+        base_prompt_text, initial_enhancement = self._prepare_prompt(request)
         current_prompt = base_prompt_text + initial_enhancement
         last_error = None
 
@@ -71,11 +73,11 @@ class TranscriptGenerator:
                 # Generate content using Gemini
                 print(f"--- Attempt {attempt + 1} ---") # Log attempt number
                 # print(f"Prompt:\\n{current_prompt}\\n---") # Optional: Log the prompt being used
-                response = self.client.models.generate_content(
-                    model="gemini-2.0-flash-001",
+                response = await gemini_limiter.call(lambda: self.client.aio.models.generate_content(
+                    model=TRANSCRIPT_MODEL,
                     contents=[Part(text=current_prompt)],
                     config=config
-                )
+                ))
 
                 # Extract transcript
                 if not response.candidates or not response.candidates[0].content.parts:
@@ -87,47 +89,15 @@ class TranscriptGenerator:
                 self.validator.validate_transcript(transcript, request)
                 
                 # --- If validation successful ---
-                word_count = len(re.findall(r'\w+', transcript))
-                estimated_duration_minutes = round(word_count / WORDS_PER_MINUTE, 2) if WORDS_PER_MINUTE > 0 else 0
-
-                # --- Save transcript to file ---
-                file_id = None # Initialize file_id
-                try:
-                    os.makedirs(TRANSCRIPT_DIR, exist_ok=True) # Create directory if it doesn't exist
-                    file_id = str(uuid.uuid4())
-                    file_path = os.path.join(TRANSCRIPT_DIR, f"{file_id}.txt")
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(transcript)
-                    print(f"Transcript saved successfully to: {file_path}") # Log saving
-                except IOError as e:
-                    # Log error but don't fail the whole process if saving fails
-                    print(f"Warning: Failed to save transcript to file: {e}")
-                    file_id = None # Reset file_id if saving failed
-                # --- End save transcript ---
-
-                return {
-                    "transcript": transcript,
-                    "word_count": word_count,
-                    "estimated_duration_minutes": estimated_duration_minutes,
-                    "file_id": file_id # Add file_id to the response
-                }
+                return self._finalize(transcript)
 
             except ValueError as ve: # Catch validation errors specifically
                 last_error = str(ve)
                 print(f"Validation failed on attempt {attempt + 1}: {last_error}")
                 if attempt < self.max_retries:
                     print("Retrying with corrective prompt...")
-                    # --- Create Corrective Prompt ---
-                    correction_instruction = (
-                        "\n\n--- CORRECTION REQUEST ---\n"
-                        f"The previous generation attempt failed validation with the following error: '{last_error}'.\\n"
-                        f"Please pay close attention to all formatting rules (especially 'SpeakerName: Text' on a single line) "
-                        f"and content requirements (like including all speakers: {', '.join(request.character_names)}).\\n"
-                        f"Regenerate the entire transcript, ensuring the output corrects this specific issue and meets all original instructions."
-                        "\n--- END CORRECTION ---"
-                    )
                     # Use the *original* base prompt plus the initial enhancement and the new correction
-                    current_prompt = base_prompt_text + initial_enhancement + correction_instruction
+                    current_prompt = base_prompt_text + initial_enhancement + self._correction_instruction(request, last_error)
                 else:
                     print("Max retries reached. Failing generation.")
                     raise HTTPException(status_code=500, detail=f"Failed to generate a valid transcript after {self.max_retries + 1} attempts. Last error: {last_error}")
@@ -142,6 +112,201 @@ class TranscriptGenerator:
         # This part should technically be unreachable if logic is correct, but as a safeguard:
         raise HTTPException(status_code=500, detail=f"Failed to generate transcript after {self.max_retries + 1} attempts. Last validation error: {last_error}")
 
+    async def generate_stream(self, request: ConceptRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a transcript with the streaming API, yielding lines as they are produced.
+
+        Every complete line is validated as it arrives. On the first format error the
+        stream is cut and the attempt is retried with a corrective prompt, instead of
+        waiting for the rest of the output budget. Clients should discard the lines of
+        an attempt when a ``retry`` event arrives.
+
+        Args:
+            request: ConceptRequest containing podcast parameters
+
+        Yields:
+            Dict: progress, transcript_line, retry and finally complete events
+
+        Raises:
+            HTTPException: If the request is invalid or generation fails after retries
+        """
+        base_prompt_text, initial_enhancement = self._prepare_prompt(request)
+        current_prompt = base_prompt_text + initial_enhancement
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            yield {
+                "type": "progress",
+                "stage": "generating",
+                "message": f"Generating transcript (attempt {attempt + 1})",
+                "attempt": attempt + 1
+            }
+
+            try:
+                lines = []
+                async for line_number, line in self._stream_lines(request, current_prompt):
+                    lines.append(line)
+                    if line.strip():
+                        yield {
+                            "type": "transcript_line",
+                            "stage": "streaming",
+                            "line": line.strip(),
+                            "lineNumber": line_number,
+                            "attempt": attempt + 1
+                        }
+                transcript = "\n".join(lines).strip()
+
+            except ValueError as ve:
+                last_error = str(ve)
+                print(f"Validation failed on streaming attempt {attempt + 1}: {last_error}")
+                if attempt < self.max_retries:
+                    yield {
+                        "type": "retry",
+                        "stage": "validation_failed",
+                        "error": last_error,
+                        "attempt": attempt + 1
+                    }
+                    current_prompt = base_prompt_text + initial_enhancement + self._correction_instruction(request, last_error)
+                    continue
+                raise HTTPException(status_code=500, detail=f"Failed to generate a valid transcript after {self.max_retries + 1} attempts. Last error: {last_error}")
+
+            yield {
+                "type": "complete",
+                "stage": "generation_complete",
+                **self._finalize(transcript)
+            }
+            return
+
+    async def _stream_lines(self, request: ConceptRequest, prompt: str) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Stream the model's output for ``prompt``, validating every line as it completes.
+
+        A throttled or transiently failed stream is retried through the shared limiter as
+        long as no non-empty line has been yielded yet; after that the error is raised,
+        since lines already sent cannot be taken back.
+
+        Yields:
+            Tuple[int, str]: The 1-based line number and every line, including empty ones
+
+        Raises:
+            ValueError: On the first invalid line, if the model returned no text, or if
+                the speaker checks of the complete transcript fail
+        """
+        retries = 0
+        while True:
+            validator = StreamingTranscriptValidator(request)
+            line_number = 0
+            sent = False
+            try:
+                async with gemini_limiter.slot():
+                    stream = await self.client.aio.models.generate_content_stream(
+                        model=TRANSCRIPT_MODEL,
+                        contents=[Part(text=prompt)],
+                        config=GenerateContentConfig(max_output_tokens=8192)
+                    )
+                    try:
+                        async for response in stream:
+                            text = response.text if response.candidates else None
+                            if not text:
+                                continue
+                            for line in validator.feed(text):
+                                line_number += 1
+                                sent = sent or bool(line.strip())
+                                yield line_number, line
+                    finally:
+                        # Stop the model as soon as validation fails or the client goes away
+                        close = getattr(stream, "aclose", None)
+                        if close is not None:
+                            await close()
+                break
+            except ValueError:
+                raise
+            except Exception as e:
+                delay = None if sent else gemini_limiter.retry_delay(e, retries)
+                if delay is None:
+                    raise
+                retries += 1
+                print(f"Transcript stream failed before any line was sent ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        for line in validator.feed("", final=True):
+            line_number += 1
+            sent = sent or bool(line.strip())
+            yield line_number, line
+
+        if not sent:
+            raise ValueError("No transcript generated by the model")
+        validator.finish()
+
+    def _prepare_prompt(self, request: ConceptRequest) -> Tuple[str, str]:
+        """
+        Clean the request's character names and build the generation prompt.
+
+        Returns:
+            Tuple[str, str]: The base prompt and the enhancement asking for every speaker
+
+        Raises:
+            HTTPException: If the number of speakers does not match the character names
+        """
+        if len(request.character_names) != request.num_speakers:
+            raise HTTPException(status_code=400, detail="Number of speakers must match number of character names")
+
+        # --- Clean Character Names --- 
+        # Strip whitespace from character names before using them
+        cleaned_character_names = [name.strip() for name in request.character_names]
+        # Update the request object in place (if mutable) or create a new one if needed.
+        # Assuming request object allows modification for simplicity. If not, adjust accordingly.
+        request.character_names = cleaned_character_names 
+        # --- End Clean Character Names ---
+
+        base_prompt_text = PromptGenerator.create_podcast_prompt(request)
+        initial_enhancement = (
+            "\n\nIMPORTANT INSTRUCTION: Ensure that the generated transcript includes dialogue "
+            # Use cleaned names in the prompt enhancement as well
+            f"from ALL of the following characters: {', '.join(request.character_names)}. " 
+            "Each character should have at least one speaking line."
+        )
+        return base_prompt_text, initial_enhancement
+
+    @staticmethod
+    def _correction_instruction(request: ConceptRequest, last_error: str) -> str:
+        """Build the corrective prompt appended after an attempt fails validation."""
+        return (
+            "\n\n--- CORRECTION REQUEST ---\n"
+            f"The previous generation attempt failed validation with the following error: '{last_error}'.\\n"
+            f"Please pay close attention to all formatting rules (especially 'SpeakerName: Text' on a single line) "
+            f"and content requirements (like including all speakers: {', '.join(request.character_names)}).\\n"
+            f"Regenerate the entire transcript, ensuring the output corrects this specific issue and meets all original instructions."
+            "\n--- END CORRECTION ---"
+        )
+
+    def _finalize(self, transcript: str) -> Dict[str, Any]:
+        """Compute metrics for a validated transcript, save it, and build the response."""
+        word_count = len(re.findall(r'\w+', transcript))
+        estimated_duration_minutes = round(word_count / WORDS_PER_MINUTE, 2) if WORDS_PER_MINUTE > 0 else 0
+
+        # --- Save transcript to file ---
+        file_id = None # Initialize file_id
+        try:
+            os.makedirs(TRANSCRIPT_DIR, exist_ok=True) # Create directory if it doesn't exist
+            file_id = str(uuid.uuid4())
+            file_path = os.path.join(TRANSCRIPT_DIR, f"{file_id}.txt")
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(transcript)
+            print(f"Transcript saved successfully to: {file_path}") # Log saving
+        except IOError as e:
+            # Log error but don't fail the whole process if saving fails
+            print(f"Warning: Failed to save transcript to file: {e}")
+            file_id = None # Reset file_id if saving failed
+        # --- End save transcript ---
+
+        return {
+            "transcript": transcript,
+            "word_count": word_count,
+            "estimated_duration_minutes": estimated_duration_minutes,
+            "file_id": file_id # Add file_id to the response
+        }
+
     async def edit(self, request: TranscriptEditRequest) -> Dict[str, Any]:
         """
         Process edited transcript, extract characters, and calculate word count.
@@ -153,16 +318,8 @@ class TranscriptGenerator:
             Dict containing processed transcript, character list, and word count
         """
         try:
-            # Extract unique character names from transcript
-            characters = set()
-            for line in request.transcript.split('\n'):
-                if ':' in line:
-                    # Handle potential errors if line doesn't split correctly
-                    parts = line.split(':', 1)
-                    if len(parts) > 0:
-                        character = parts[0].strip()
-                        if character: # Ensure character name is not empty
-                            characters.add(character)
+            # Extract unique character names, in order of appearance
+            characters = dict.fromkeys(turn.speaker for turn in parse_transcript(request.transcript))
             
             # Calculate word count
             word_count = len(re.findall(r'\w+', request.transcript))
@@ -194,6 +351,13 @@ class TranscriptGenerator:
         Raises:
             HTTPException: If extension or validation fails
         """
+        key = make_request_key("extend", request.dict(exclude={"useCache"}))
+        return await transcript_cache.get_or_compute(
+            key, lambda: self._extend(request), use_cache=request.useCache
+        )
+
+    async def _extend(self, request: TranscriptExtendRequest) -> Dict[str, Any]:
+        """Run the model call and metrics for ``extend``."""
         try:
             # Basic validation
             if not request.transcript or not request.characters:
@@ -220,11 +384,11 @@ class TranscriptGenerator:
             )
 
             # Generate content using Gemini
-            response = self.client.models.generate_content(
-                model="gemini-2.0-flash-001", 
+            response = await gemini_limiter.call(lambda: self.client.aio.models.generate_content(
+                model=TRANSCRIPT_MODEL,
                 contents=[Part(text=prompt)],
                 config=config
-            )
+            ))
 
             # Extract the *additional* transcript generated
             if not response.candidates or not response.candidates[0].content.parts:
@@ -1,39 +1,76 @@
-import re # Import re module
-from typing import List, Set, Dict
+from typing import List, Dict
 from app.core.models import ConceptRequest
+from app.services.transcript_parser import TranscriptParser
 
-class TranscriptValidator:
-    @staticmethod
-    def validate_transcript(transcript: str, request: ConceptRequest) -> None:
+class StreamingTranscriptValidator:
+    """
+    Single-pass transcript validator that can be fed text as it is generated.
+
+    Format errors are raised from ``feed``/``feed_line`` as soon as the offending line is
+    complete, so a streaming generation can be aborted early. Speaker checks need the
+    whole transcript and run in ``finish``.
+    """
+
+    def __init__(self, request: ConceptRequest):
+        self.request = request
+        self.parser = TranscriptParser()
+
+    def feed(self, chunk: str, final: bool = False) -> List[str]:
         """
-        Validate the generated transcript format and content.
-        
+        Validate a chunk of text; a trailing partial line is checked once it is complete.
+
         Args:
-            transcript: Generated transcript text
-            request: Original concept request
-            
+            chunk: Next piece of the transcript
+            final: Treat a trailing partial line as complete (the end of the text)
+
+        Returns:
+            List[str]: The lines completed and validated by this chunk, in order
+
         Raises:
-            ValueError: If validation fails
+            ValueError: On the first line that is not a "Speaker: text" line
         """
-        # Split into lines and clean
-        lines = [line.strip() for line in transcript.split('\n') if line.strip()]
-        
-        # Validate format using regex: Check for "Any Name: " pattern
+        lines = self.parser.split_lines(chunk, final)
+        for line in lines:
+            self.feed_line(line)
+        return lines
+
+    def feed_line(self, line: str) -> None:
+        """
+        Validate one line (without its newline).
+
+        Raises:
+            ValueError: If the line is not a "Speaker: text" line
+        """
+        self.parser.feed_line(line)
+        self._check_format()
+
+    def _check_format(self) -> None:
+        # Validate format: every line must match the "Any Name: " pattern.
         # This is more flexible than checking against only requested characters.
-        invalid_lines = [
-            line for line in lines 
-            if not re.match(r"^[^:]+:\s+", line) 
-        ]
-        if invalid_lines:
+        if self.parser.malformed:
+            line_no, line = self.parser.malformed[0]
             # Keep the error message clear about the expected format
             raise ValueError(
                 f"Transcript format invalid. Each line must start with a speaker name followed by ':' and a space. "
-                f"Invalid lines found: {invalid_lines[:3]}"
+                f"Invalid line {line_no}: {line!r}"
             )
 
+    def finish(self) -> None:
+        """
+        Validate the remaining text and the speakers of the complete transcript.
+
+        Raises:
+            ValueError: If validation fails
+        """
+        self.parser.finish()
+        self._check_format()
+
+        request = self.request
+        parser = self.parser
+
         # --- Case-Insensitive Speaker Checks ---
         # Extract speakers found, converting to lowercase for comparison
-        speakers_found_raw = set(line.split(':', 1)[0].strip() for line in lines if ':' in line)
+        speakers_found_raw = set(parser.speaker_turns)
         speakers_found_lower = {name.lower() for name in speakers_found_raw}
         
         # Convert requested names to lowercase set for comparison
@@ -59,12 +96,14 @@ class TranscriptValidator:
         present_speakers_original_case = {requested_speakers_original_case_map[lower_name] for lower_name in present_speakers_lower}
 
         if len(present_speakers_original_case) > 1: # Only check balance if multiple requested speakers are present
-            speaker_counts = {}
-            for name_original in present_speakers_original_case:
-                # Count lines starting with the speaker name, case-insensitively
-                pattern = re.compile(rf"^{re.escape(name_original)}:\s+", re.IGNORECASE)
-                count = sum(1 for line in lines if pattern.match(line))
-                speaker_counts[name_original] = count
+            # Count turns per speaker, case-insensitively
+            turns_lower: Dict[str, int] = {}
+            for name, count in parser.speaker_turns.items():
+                turns_lower[name.lower()] = turns_lower.get(name.lower(), 0) + count
+            speaker_counts = {
+                name_original: turns_lower.get(name_original.lower(), 0)
+                for name_original in present_speakers_original_case
+            }
                 
             print(f"Speaker counts (case-insensitive match): {speaker_counts}") # Debugging output
 
@@ -86,4 +125,21 @@ class TranscriptValidator:
         unrequested_speakers_raw = speakers_found_raw - set(request.character_names) 
         if unrequested_speakers_raw:
             print(f"Warning: Speakers present in transcript that differ in case or were not in original request: {', '.join(sorted(unrequested_speakers_raw))}")
-        # --- End Case-Insensitive Speaker Checks --- 
\ No newline at end of file
+        # --- End Case-Insensitive Speaker Checks ---
+
+class TranscriptValidator:
+    @staticmethod
+    def validate_transcript(transcript: str, request: ConceptRequest) -> None:
+        """
+        Validate the generated transcript format and content.
+        
+        Args:
+            transcript: Generated transcript text
+            request: Original concept request
+            
+        Raises:
+            ValueError: If validation fails
+        """
+        validator = StreamingTranscriptValidator(request)
+        validator.feed(transcript)
+        validator.finish()
@@ -0,0 +1,259 @@
+from collections import Counter
+from collections.abc import Sequence
+from itertools import accumulate, chain, repeat
+from operator import add, itemgetter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+import re
+import sys
+
+_WORD = re.compile(r"\w+")
+
+class Turn(NamedTuple):
+    """
+    One speaker turn of a transcript.
+
+    ``start``/``end`` are character offsets of the turn in the transcript and ``line``/
+    ``end_line`` the 1-based lines it spans. Speaker names are interned, so the many turns
+    of one speaker share a single string.
+    """
+
+    speaker: str
+    text: str
+    start: int
+    end: int
+    line: int
+    end_line: int
+
+    @property
+    def word_count(self) -> int:
+        return len(_WORD.findall(self.text))
+
+    def __repr__(self) -> str:
+        return f"Turn(speaker={self.speaker!r}, line={self.line}, words={self.word_count})"
+
+# Builds a Turn from a tuple of its fields, skipping the generated keyword-argument __new__
+_new_turn = tuple.__new__
+
+# A turn as stored: the ``Turn`` fields in a plain tuple
+_Row = Tuple[str, str, int, int, int, int]
+
+class TurnList(Sequence):
+    """
+    The turns of a transcript, stored as plain tuples and returned as ``Turn`` on access.
+
+    The garbage collector stops tracking a plain tuple of strings and ints, but never a
+    tuple subclass, so keeping a ``Turn`` per turn of a multi-MB transcript would make
+    every full collection, during the parse and after it, walk all of them.
+    """
+
+    __slots__ = ("_rows",)
+
+    def __init__(self):
+        self._rows: List[_Row] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(map(_new_turn, repeat(Turn), self._rows[index]))
+        return _new_turn(Turn, self._rows[index])
+
+    def __iter__(self) -> Iterator[Turn]:
+        return map(_new_turn, repeat(Turn), self._rows)
+
+    def append(self, row: _Row) -> None:
+        self._rows.append(row)
+
+    def extend(self, rows: List[_Row]) -> None:
+        self._rows.extend(rows)
+
+    def speakers(self) -> Iterator[str]:
+        """The speaker of each turn, without building the turns."""
+        return map(itemgetter(0), self._rows)
+
+class TranscriptParser:
+    """
+    Single-pass parser for "Speaker: text" transcripts.
+
+    A line containing ':' starts a new turn; other non-empty lines continue the current
+    turn. Text before the first speaker line, and turns with an empty speaker name, are
+    dropped. A complete transcript is parsed in one batch pass with ``parse``; streamed
+    input can be fed in arbitrary chunks (e.g. as a model streams it) or one line at a time.
+
+    Lines that are not strict ``Speaker: text`` headers (continuation lines, or a colon
+    without a following space) are collected in ``malformed`` as ``(line number, line)``
+    so validators can report them without another pass.
+    """
+
+    def __init__(self):
+        self.turns = TurnList()
+        self.malformed: List[Tuple[int, str]] = []
+        self._buffer = ""
+        self._offset = 0
+        self._line_no = 0
+
+        # The turn being accumulated
+        self._speaker: Optional[str] = None
+        self._parts: List[str] = []
+        self._start = 0
+        self._end = 0
+        self._line = 0
+        self._end_line = 0
+
+    @property
+    def speaker_turns(self) -> Dict[str, int]:
+        """Number of turns per speaker."""
+        return Counter(self.turns.speakers())
+
+    def parse(self, transcript: str) -> TurnList:
+        """
+        Parse a complete transcript in one batch pass and return all turns.
+
+        Same result as ``feed(transcript)`` then ``finish()`` on a fresh parser, but the
+        parser state lives in locals and offsets come from cumulative line lengths rather
+        than per-line method calls. Use it on a fresh parser; the incremental path is for
+        streamed input.
+        """
+        intern = sys.intern
+        malformed = self.malformed
+        rows: List[_Row] = []
+        append = rows.append
+        # Continuation lines of the last turn, folded into it at the next header
+        parts: Optional[List[str]] = None
+        end = end_line = 0
+
+        lines = transcript.split("\n")
+        # line_starts[n] is the offset of line n (1-based): the lengths of the lines before it
+        # plus one newline each, after a placeholder for line 0
+        line_starts = list(accumulate(chain((0,), map(add, map(len, lines), repeat(1))), initial=0))
+        for number, raw in enumerate(lines, 1):
+            stripped = raw.strip()
+            if not stripped:
+                continue
+
+            # Splitting on ": " leaves the text unstripped for the common "Speaker: text"
+            head, colon, tail = stripped.partition(": ")
+            if not colon or ":" in head:
+                head, colon, tail = stripped.partition(":")
+                if colon and (not head or not tail[:1].isspace()):
+                    malformed.append((number, stripped))
+            elif not head:
+                malformed.append((number, stripped))
+
+            if colon:
+                if parts is not None:
+                    rows[-1] = _fold(rows[-1], parts, end, end_line)
+                    parts = None
+
+                start = line_starts[number]
+                if raw is stripped:
+                    # No surrounding whitespace, the common case
+                    append((intern(head.rstrip()), tail.lstrip(), start, start + len(raw), number, number))
+                else:
+                    append((intern(head.rstrip()), tail.strip(), start + len(raw) - len(raw.lstrip()),
+                            start + len(raw.rstrip()), number, number))
+                continue
+
+            # Continue the current turn
+            malformed.append((number, stripped))
+            if rows:
+                if parts is None:
+                    parts = [rows[-1][1]]
+                parts.append(stripped)
+                end, end_line = line_starts[number] + len(raw.rstrip()), number
+
+        if parts is not None:
+            rows[-1] = _fold(rows[-1], parts, end, end_line)
+        # Turns with an empty speaker name are dropped
+        if not all(map(itemgetter(0), rows)):
+            rows = [row for row in rows if row[0]]
+        self.turns.extend(rows)
+        return self.turns
+
+    def feed(self, chunk: str) -> List[Turn]:
+        """
+        Parse a chunk of text; a trailing partial line is kept until more text arrives.
+
+        Returns:
+            List[Turn]: Turns completed by this chunk
+        """
+        completed = len(self.turns)
+        for line in self.split_lines(chunk):
+            self.feed_line(line)
+        return self.turns[completed:]
+
+    def split_lines(self, chunk: str, final: bool = False) -> List[str]:
+        """
+        Split buffered text plus ``chunk`` into complete lines, without parsing them.
+
+        A trailing partial line is kept in the buffer, unless ``final`` is set.
+        """
+        lines = (self._buffer + chunk).split("\n")
+        self._buffer = lines.pop()
+        if final and self._buffer:
+            lines.append(self._buffer)
+            self._buffer = ""
+        return lines
+
+    def feed_line(self, line: str) -> Optional[Turn]:
+        """
+        Parse one line (without its newline).
+
+        Returns:
+            Optional[Turn]: The previous turn, if this line started a new one
+        """
+        start = self._offset
+        self._offset += len(line) + 1
+        self._line_no += 1
+
+        stripped = line.strip()
+        if not stripped:
+            return None
+
+        colon = stripped.find(":")
+        if colon == -1:
+            # Continue the current turn
+            self.malformed.append((self._line_no, stripped))
+            if self._speaker is not None:
+                self._parts.append(stripped)
+                self._end = start + len(line.rstrip())
+                self._end_line = self._line_no
+            return None
+
+        if colon == 0 or colon + 1 == len(stripped) or not stripped[colon + 1].isspace():
+            self.malformed.append((self._line_no, stripped))
+
+        completed = self._flush()
+        self._speaker = stripped[:colon].strip()
+        self._parts = [stripped[colon + 1:].strip()]
+        self._start = start + len(line) - len(line.lstrip())
+        self._end = start + len(line.rstrip())
+        self._line = self._end_line = self._line_no
+        return completed
+
+    def finish(self) -> TurnList:
+        """Parse any remaining text and return all turns."""
+        for line in self.split_lines("", final=True):
+            self.feed_line(line)
+        self._flush()
+        return self.turns
+
+    def _flush(self) -> Optional[Turn]:
+        speaker, self._speaker = self._speaker, None
+        if not speaker:
+            return None
+
+        speaker = sys.intern(speaker)
+        row = (speaker, " ".join(self._parts), self._start, self._end, self._line, self._end_line)
+        self.turns.append(row)
+        return _new_turn(Turn, row)
+
+def _fold(row: _Row, parts: List[str], end: int, end_line: int) -> _Row:
+    """Extend a turn with its continuation lines (``parts`` starts with its own text)."""
+    speaker, _, start, _, line, _ = row
+    return speaker, " ".join(parts), start, end, line, end_line
+
+def parse_transcript(transcript: str) -> TurnList:
+    """Parse a complete transcript into turns."""
+    return TranscriptParser().parse(transcript)
@@ -1,17 +1,14 @@
 from typing import List, Dict
-from google import genai
 from pydantic import TypeAdapter
 from app.core.models import SpeakerConfig, VoiceCharacteristics, SpeakingRate, SpeechPatterns
-from app.core.config import settings
+from app.services.gemini_client import get_gemini_client
+from app.services.rate_limiter import gemini_limiter
 
 class VoiceConfigGenerator:
-    def __init__(self):
-        """Initialize the VoiceConfigGenerator with Gemini client."""
-        self.client = genai.Client(
-            project=settings.PROJECT_ID,
-            location="us-central1", 
-            vertexai=True
-        )
+    @property
+    def client(self):
+        """The shared Gemini client, created on first use."""
+        return get_gemini_client()
 
     def _create_prompt(self, transcript: str, speakers: List[str]) -> str:
         """Create a prompt for Gemini to generate voice configurations."""
@@ -43,13 +40,13 @@ class VoiceConfigGenerator:
         try:
             prompt = self._create_prompt(transcript, speakers)
             
-            response = self.client.models.generate_content(
+            response = await gemini_limiter.call(lambda: self.client.aio.models.generate_content(
                 model="gemini-2.0-flash-001",
                 contents=[{"text": prompt}],
                 config={
                     "max_output_tokens": 8192,
                 }
-            )
+            ))
 
             if not response.candidates:
                 raise ValueError("No configurations generated")
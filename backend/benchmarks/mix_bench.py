@@ -0,0 +1,105 @@
+"""
+Mixer benchmark: ``AudioMixer.mix_arrays`` against the chained ``AudioSegment.append`` calls
+that ``AudioProcessor.combine_segments`` used before it.
+
+Every ``append`` copies the whole episode built so far, so the old chain is quadratic in the
+number of segments while the mixer writes each sample once. Before timing anything, the
+mixer output is checked to be bit-identical to the append chain for several
+crossfade/silence settings. Segment lengths are whole milliseconds, since ``append`` slices
+at millisecond granularity while the mixer works in frames.
+
+The timed run defaults to a 300ms crossfade into a 500ms gap: the production default of a
+1000ms crossfade is longer than the silence, which the append chain rejects and the mixer
+clamps.
+
+Run from the backend directory:
+
+    python benchmarks/mix_bench.py --segments 500
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from pydub import AudioSegment
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.audio_generator.mixer import AudioMixer
+
+FRAME_RATE = 24000
+
+# (crossfade_ms, silence_ms) pairs checked for bit-identical output
+EQUIVALENCE_SETTINGS = [(300, 500), (50, 500), (200, 200)]
+
+def make_segments(count: int, seconds: float, seed: int = 0) -> List[AudioSegment]:
+    """Mono 16-bit segments of noisy tones with lengths varying around ``seconds``."""
+    rng = np.random.default_rng(seed)
+    segments = []
+    for index in range(count):
+        frames = int(1000 * seconds * rng.uniform(0.5, 1.5)) * FRAME_RATE // 1000
+        t = np.arange(frames) / FRAME_RATE
+        tone = 8000 * np.sin(2 * np.pi * (180 + 20 * (index % 10)) * t)
+        samples = (tone + rng.normal(0, 2000, frames)).clip(-32768, 32767).astype(np.int16)
+        segments.append(AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=FRAME_RATE, channels=1))
+    return segments
+
+def append_chain(segments: List[AudioSegment], crossfade_ms: int, silence_ms: int) -> AudioSegment:
+    """The pre-mixer ``combine_segments`` loop."""
+    combined = segments[0]
+    for segment in segments[1:]:
+        silence = AudioSegment.silent(duration=silence_ms)
+        combined = combined.append(silence, crossfade=crossfade_ms)
+        combined = combined.append(segment, crossfade=crossfade_ms)
+    return combined
+
+def mix(segments: List[AudioSegment], crossfade_ms: int, silence_ms: int) -> np.ndarray:
+    mixer = AudioMixer(crossfade_duration=crossfade_ms, silence_duration=silence_ms)
+    return mixer.mix_arrays([AudioMixer.to_array(segment) for segment in segments], FRAME_RATE)
+
+def check_equivalence(segments: List[AudioSegment]) -> None:
+    for crossfade_ms, silence_ms in EQUIVALENCE_SETTINGS:
+        expected = AudioMixer.to_array(append_chain(segments, crossfade_ms, silence_ms))
+        actual = mix(segments, crossfade_ms, silence_ms)
+        assert actual.shape == expected.shape, (
+            f"crossfade={crossfade_ms} silence={silence_ms}: {actual.shape} != {expected.shape}"
+        )
+        assert np.array_equal(actual, expected), (
+            f"crossfade={crossfade_ms} silence={silence_ms}: "
+            f"{np.count_nonzero(actual != expected)} samples differ"
+        )
+        print(f"crossfade={crossfade_ms:4d}ms silence={silence_ms:4d}ms: bit-identical "
+              f"({len(actual)} frames, {len(segments)} segments)")
+
+def timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0, help="average segment length")
+    parser.add_argument("--check-segments", type=int, default=40,
+                        help="segments used for the bit-identical check")
+    parser.add_argument("--crossfade", type=int, default=300)
+    parser.add_argument("--silence", type=int, default=500)
+    args = parser.parse_args()
+
+    check_equivalence(make_segments(args.check_segments, args.seconds, seed=1))
+
+    segments = make_segments(args.segments, args.seconds)
+    arrays = [AudioMixer.to_array(segment) for segment in segments]
+    mixer = AudioMixer(crossfade_duration=args.crossfade, silence_duration=args.silence)
+
+    mixer_seconds = timed(mixer.mix_arrays, arrays, FRAME_RATE)
+    append_seconds = timed(append_chain, segments, args.crossfade, args.silence)
+
+    print(f"{args.segments} segments, crossfade={args.crossfade}ms silence={args.silence}ms")
+    print(f"  append chain:          {append_seconds:8.2f} s")
+    print(f"  AudioMixer.mix_arrays: {mixer_seconds:8.2f} s ({append_seconds / mixer_seconds:.0f}x)")
+
+if __name__ == "__main__":
+    main()
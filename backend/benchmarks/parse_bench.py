@@ -0,0 +1,107 @@
+"""
+Transcript parsing benchmark on a multi-MB transcript.
+
+Compares ``parse_transcript`` (the batch pass) and ``TranscriptParser`` fed in
+streaming-sized chunks against the split-based line parser ``AudioGenerator.generate``
+used before them, and checks that all produce the same turns. The candidates run
+interleaved, so load changes on the machine hit all of them alike; best and median times
+are reported with the ratio to the legacy parser. ``tests/test_transcript_parser.py``
+covers equivalence on the malformed-line edge cases; this transcript is shaped like real
+model output.
+
+Run from the backend directory:
+
+    python benchmarks/parse_bench.py --megabytes 10 --runs 5
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.transcript_parser import TranscriptParser, parse_transcript
+
+SPEAKERS = ["Alice", "Bob", "Dr. Carol", "Dan"]
+WORDS = "so the thing about this is that we really never expected it to work out".split()
+
+def legacy_parse(transcript: str):
+    """The line parser AudioGenerator.generate used before TranscriptParser."""
+    segments = []
+    current_speaker = None
+    current_text = []
+
+    for line in transcript.split("\n"):
+        if not line.strip():
+            continue
+
+        if ":" in line:
+            if current_speaker and current_text:
+                segments.append((current_speaker, " ".join(current_text)))
+                current_text = []
+
+            speaker, text = line.split(":", 1)
+            current_speaker = speaker.strip()
+            current_text = [text.strip()]
+        else:
+            current_text.append(line.strip())
+
+    if current_speaker and current_text:
+        segments.append((current_speaker, " ".join(current_text)))
+    return segments
+
+def make_transcript(megabytes: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        line = f"{rng.choice(SPEAKERS)}: {' '.join(rng.choices(WORDS, k=rng.randint(5, 60)))}"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+def parse_chunked(transcript: str, chunk_size: int):
+    parser = TranscriptParser()
+    for start in range(0, len(transcript), chunk_size):
+        parser.feed(transcript[start:start + chunk_size])
+    return parser.finish()
+
+def interleaved_seconds(candidates, runs: int):
+    """Time each candidate ``runs`` times, one run of each in turn."""
+    timings = {label: [] for label, _ in candidates}
+    for _ in range(runs):
+        for label, fn in candidates:
+            started = time.perf_counter()
+            fn()
+            timings[label].append(time.perf_counter() - started)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, default=10)
+    parser.add_argument("--runs", type=int, default=11)
+    parser.add_argument("--chunk-size", type=int, default=256, help="characters per streamed chunk")
+    args = parser.parse_args()
+
+    transcript = make_transcript(args.megabytes)
+    expected = legacy_parse(transcript)
+    assert [(turn.speaker, turn.text) for turn in parse_transcript(transcript)] == expected
+    assert [(turn.speaker, turn.text) for turn in parse_chunked(transcript, args.chunk_size)] == expected
+
+    print(f"{len(transcript) / 1e6:.1f} MB transcript, {len(expected)} turns, {args.runs} interleaved runs")
+    candidates = [
+        ("legacy split parser", lambda: legacy_parse(transcript)),
+        ("parse_transcript (batch pass)", lambda: parse_transcript(transcript)),
+        (f"TranscriptParser, {args.chunk_size}-char chunks", lambda: parse_chunked(transcript, args.chunk_size))
+    ]
+    timings = interleaved_seconds(candidates, args.runs)
+    legacy_best = min(timings["legacy split parser"])
+    for label, runs in timings.items():
+        best = min(runs)
+        print(f"  {label + ':':36s} best {best * 1000:7.1f} ms  median {statistics.median(runs) * 1000:7.1f} ms"
+              f"  {best / legacy_best:4.2f}x legacy")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Post-processing benchmark: how segment decode/normalize/encode throughput scales with workers.
+
+Runs ``postprocess.process_segment`` on synthetic model output through an ``EncoderPool``
+in thread and process mode for each pool size, and reports segments per second and the
+speedup over a single worker. Thread mode is bounded by the GIL for the NumPy/pydub
+parts of the job; process mode should scale with the number of cores up to the pool size,
+so run this on a multi-core machine to see the difference.
+
+Run from the backend directory:
+
+    python benchmarks/postprocess_bench.py --segments 32 --seconds 8 --pool-sizes 1,2,4,8
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.audio_generator.encoder import EncoderPool
+from app.services.audio_generator.postprocess import process_segment
+
+FRAME_RATE = 24000
+PCM_MIME_TYPE = f"audio/L16;codec=pcm;rate={FRAME_RATE}"
+
+def make_parts(seconds: float, seed: int):
+    """One synthesized turn as the model returns it: a single raw PCM part."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(FRAME_RATE * seconds)) / FRAME_RATE
+    samples = 6000 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 1500, len(t))
+    return [(samples.clip(-32768, 32767).astype(np.int16).tobytes(), PCM_MIME_TYPE)]
+
+def quiet_process_segment(*args):
+    # decode_audio logs every L16 payload it parses; workers run one job at a time
+    with contextlib.redirect_stdout(io.StringIO()):
+        return process_segment(*args)
+
+async def run_batch(pool: EncoderPool, chunks, output_dir: Path) -> float:
+    job = quiet_process_segment if pool.mode == "process" else process_segment
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        pool.run(job, [parts], output_dir / f"{index}.mp3", "mp3", pool.bitrate,
+                 -16.0, -1.5, 50)
+        for index, parts in enumerate(chunks)
+    ])
+    return time.perf_counter() - started
+
+async def warm_up_and_run(pool: EncoderPool, chunks, output_dir: Path) -> float:
+    # Start the workers (process spawn, imports) before timing
+    await run_batch(pool, chunks[:pool.pool_size], output_dir)
+    return await run_batch(pool, chunks, output_dir)
+
+def measure(mode: str, pool_size: int, chunks, output_dir: Path) -> float:
+    pool = EncoderPool(pool_size=pool_size, queue_depth=len(chunks), mode=mode)
+    # Thread workers share this process's stdout, so silence it around the whole batch
+    quiet = contextlib.redirect_stdout(io.StringIO()) if mode == "thread" else contextlib.nullcontext()
+    try:
+        with quiet:
+            return asyncio.run(warm_up_and_run(pool, chunks, output_dir))
+    finally:
+        pool._executor.shutdown()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=8.0, help="length of each segment")
+    parser.add_argument("--pool-sizes", default="1,2,4,8")
+    parser.add_argument("--modes", default="thread,process")
+    args = parser.parse_args()
+
+    pool_sizes = [int(size) for size in args.pool_sizes.split(",")]
+    chunks = [make_parts(args.seconds, seed) for seed in range(args.segments)]
+    print(f"{args.segments} segments of {args.seconds:g}s on {os.cpu_count()} CPU core(s)")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in args.modes.split(","):
+            baseline = None
+            for pool_size in pool_sizes:
+                elapsed = measure(mode, pool_size, chunks, Path(workdir))
+                baseline = baseline or elapsed
+                print(f"  {mode:7s} pool_size={pool_size:2d}: {elapsed:7.2f} s "
+                      f"{args.segments / elapsed:7.1f} segments/s  {baseline / elapsed:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Startup benchmark: time to import the app, and to build the AudioGenerator on first use.
+
+Importing ``app.main`` must not touch the filesystem or build services; the generator
+(directory setup, segment cache index, encoder pool) is built by the first request that
+needs it. This measures both in fresh interpreters, with a segment cache of
+``--cache-files`` entries to show that the cache scan no longer lands on import.
+
+Run from the backend directory:
+
+    python benchmarks/startup_bench.py --runs 5 --cache-files 20000
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_SCRIPT = """
+import time
+started = time.perf_counter()
+import app.main
+print(time.perf_counter() - started)
+"""
+
+FIRST_USE_SCRIPT = """
+import time
+import app.main
+from app.api.routes.audio import get_audio_generator
+started = time.perf_counter()
+get_audio_generator()
+print(time.perf_counter() - started)
+"""
+
+def time_in_subprocess(script: str, cwd: Path) -> float:
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR), ENCODER_POOL_MODE="thread")
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def populate_cache(root: Path, files: int) -> None:
+    cache_dir = root / "podcast_outputs" / "segments" / "cache"
+    for index in range(files):
+        key = f"{index:064x}"
+        shard = cache_dir / key[:2]
+        shard.mkdir(parents=True, exist_ok=True)
+        (shard / f"{key}.{index:032x}.mp3").write_bytes(b"\0" * 64)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cache-files", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        root = Path(workdir)
+        populate_cache(root, args.cache_files)
+
+        imports = [time_in_subprocess(IMPORT_SCRIPT, root) for _ in range(args.runs)]
+        created = sorted(path.name for path in root.iterdir())
+        first_use = [time_in_subprocess(FIRST_USE_SCRIPT, root) for _ in range(args.runs)]
+
+    print(f"import app.main:          median {statistics.median(imports) * 1000:8.1f} ms over {args.runs} runs")
+    print(f"first get_audio_generator: median {statistics.median(first_use) * 1000:8.1f} ms "
+          f"({args.cache_files} cached segments)")
+    print(f"entries in working directory after import: {created}")
+
+if __name__ == "__main__":
+    main()
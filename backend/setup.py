@@ -11,6 +11,8 @@ setup(
         "google-cloud-aiplatform",
         "google-genai",
         "pydub",
+        "numpy",
+        "lameenc",
         "python-dotenv",
     ],
 ) 
\ No newline at end of file
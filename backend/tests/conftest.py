@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import rate_limiter
+from app.services.audio_generator import AudioGenerator
+from app.services.audio_generator import audio_generator as audio_generator_module
+
+PCM_MIME_TYPE = "audio/L16;codec=pcm;rate=24000"
+
+def make_pcm(seconds: float = 0.1, frequency: float = 220.0, rate: int = 24000) -> bytes:
+    """Raw 16-bit mono PCM of a sine tone, as the speech model returns it."""
+    t = np.arange(int(seconds * rate)) / rate
+    return (np.sin(2 * np.pi * frequency * t) * 8000).astype("<i2").tobytes()
+
+def make_speaker_config(name: str) -> dict:
+    """A complete speaker configuration as sent by the frontend."""
+    return {
+        "name": name,
+        "gender": "female",
+        "age": 35,
+        "voice_tone": "warm",
+        "accent": "neutral",
+        "persona": "a podcast host",
+        "background": "ten years of radio",
+        "speaking_rate": {"normal": 150, "excited": 180, "analytical": 130},
+        "voice_characteristics": {
+            "pitch_range": "medium",
+            "resonance": "chest",
+            "breathiness": "low",
+            "vocal_energy": "moderate",
+            "pause_pattern": "natural",
+            "emphasis_pattern": "key words",
+            "emotional_range": "wide",
+            "breathing_pattern": "relaxed"
+        },
+        "speech_patterns": {
+            "phrasing": "conversational",
+            "rhythm": "steady",
+            "articulation": "clear",
+            "modulation": "varied"
+        }
+    }
+
+def audio_response(data: bytes, mime_type: str = PCM_MIME_TYPE):
+    """A generate_content response carrying one inline audio part."""
+    part = SimpleNamespace(inline_data=SimpleNamespace(data=data, mime_type=mime_type))
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+class FakeModels:
+    """
+    Stand-in for ``client.aio.models`` whose calls sleep for ``delay`` seconds.
+
+    Every call is recorded as (text, started, finished), and the peak number of calls in
+    flight at once is tracked.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_content(self, model, contents, config):
+        started = time.monotonic()
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        self.calls.append((contents[-1].text, started, time.monotonic()))
+        return audio_response(make_pcm())
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """A fresh, unthrottled Gemini limiter, so no state leaks between event loops."""
+    fresh = rate_limiter.GeminiRateLimiter(
+        bucket=rate_limiter.TokenBucket(rate=0, capacity=1),
+        concurrency=rate_limiter.AdaptiveConcurrencyLimiter(initial=64, minimum=1, maximum=64),
+        max_retries=0
+    )
+    monkeypatch.setattr(audio_generator_module, "gemini_limiter", fresh)
+    return fresh
+
+@pytest.fixture
+def fake_models(monkeypatch, limiter):
+    """Route the audio generator's Gemini calls to a ``FakeModels``."""
+    models = FakeModels()
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    monkeypatch.setattr(audio_generator_module, "get_gemini_client", lambda: client)
+    return models
+
+@pytest.fixture
+def audio_generator(tmp_path, monkeypatch):
+    """An AudioGenerator writing below a temporary directory, with a thread encoder pool."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "ENCODER_POOL_MODE", "thread")
+    return AudioGenerator()
+
+def collect(events):
+    """Drive an async event generator to completion and return its events."""
+    async def run():
+        return [event async for event in events]
+    return asyncio.run(run())
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services.audio_generator import audio_generator as audio_generator_module
+from conftest import FakeModels, collect, make_speaker_config
+
+class RecordingModels(FakeModels):
+    """``FakeModels`` that also records (model, config) and can fail the batched calls."""
+
+    def __init__(self, fail_batches: bool = False):
+        super().__init__(delay=0)
+        self.fail_batches = fail_batches
+        self.requests = []
+
+    async def generate_content(self, model, contents, config):
+        self.requests.append((model, contents[-1].text, config))
+        if self.fail_batches and model == settings.AUDIO_BATCH_MODEL:
+            raise ValueError("batch rejected")
+        return await super().generate_content(model, contents, config)
+
+def batch_request():
+    return {
+        "transcript": "Alice: Hi Bob.\nBob: Hi Alice.\nAlice: Shall we start?",
+        "voiceMappings": {
+            "Alice": {"voice": "Kore", "config": make_speaker_config("Alice")},
+            "Bob": {"voice": "Puck", "config": make_speaker_config("Bob")}
+        },
+        "useCache": False,
+        "batchTurns": True
+    }
+
+def install(monkeypatch, models):
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    monkeypatch.setattr(audio_generator_module, "get_gemini_client", lambda: client)
+
+def test_batch_prompt_is_inline_without_system_instruction(audio_generator, limiter, monkeypatch):
+    models = RecordingModels()
+    install(monkeypatch, models)
+
+    events = collect(audio_generator.generate(batch_request()))
+
+    assert events[-1]["type"] == "complete"
+    [(model, text, config)] = models.requests
+    assert model == settings.AUDIO_BATCH_MODEL
+    assert config.system_instruction is None
+    lines = text.split("\n")
+    assert lines[0].startswith("Voice Alice like this: You are a female speaker")
+    assert lines[1].startswith("Voice Bob like this: ")
+    assert lines[2:] == [
+        "TTS the following conversation between Alice and Bob:",
+        "Alice: Hi Bob.", "Bob: Hi Alice.", "Alice: Shall we start?"
+    ]
+
+def test_failed_batch_falls_back_to_one_call_per_turn(audio_generator, limiter, monkeypatch):
+    models = RecordingModels(fail_batches=True)
+    install(monkeypatch, models)
+
+    events = collect(audio_generator.generate(batch_request()))
+
+    assert events[-1]["type"] == "complete"
+    assert [text for model, text, _ in models.requests if model != settings.AUDIO_BATCH_MODEL] == \
+        ["Hi Bob.", "Hi Alice.", "Shall we start?"]
+    completed = [event for event in events if event["type"] == "segment_complete"]
+    assert [(event["index"], event["turns"]) for event in completed] == [(0, [0]), (1, [1]), (2, [2])]
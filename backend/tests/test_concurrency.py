@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.audio_generator import audio_generator as audio_generator_module
+from conftest import make_speaker_config
+
+def podcast_request(label: str, turns: int = 4, **overrides):
+    transcript = "\n".join(
+        f"{'Alice' if index % 2 == 0 else 'Bob'}: {label} turn {index}." for index in range(turns)
+    )
+    request = {
+        "transcript": transcript,
+        "voiceMappings": {
+            "Alice": {"voice": "Kore", "config": make_speaker_config("Alice")},
+            "Bob": {"voice": "Puck", "config": make_speaker_config("Bob")}
+        },
+        "useCache": False,
+        "maxConcurrency": 2
+    }
+    request.update(overrides)
+    return request
+
+async def run_to_completion(events):
+    return [event async for event in events]
+
+def test_concurrent_requests_overlap_within_global_limit(audio_generator, fake_models, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIO_GLOBAL_CONCURRENCY", 3)
+
+    async def main():
+        return await asyncio.gather(
+            run_to_completion(audio_generator.generate(podcast_request("first"))),
+            run_to_completion(audio_generator.generate(podcast_request("second")))
+        )
+
+    first, second = asyncio.run(main())
+    assert first[-1]["type"] == "complete" and len(first[-1]["segments"]) == 4
+    assert second[-1]["type"] == "complete" and len(second[-1]["segments"]) == 4
+
+    def window(label):
+        calls = [(started, finished) for text, started, finished in fake_models.calls if text.startswith(label)]
+        assert len(calls) == 4
+        return min(started for started, _ in calls), max(finished for _, finished in calls)
+
+    first_start, first_end = window("first")
+    second_start, second_end = window("second")
+    # Neither request waits for the other to finish
+    assert first_start < second_end and second_start < first_end
+    assert fake_models.max_active > 2  # more than one request's worth was in flight
+    assert fake_models.max_active <= 3
+
+def test_request_concurrency_is_capped(audio_generator, fake_models):
+    events = asyncio.run(run_to_completion(audio_generator.generate(podcast_request("solo", turns=6))))
+
+    assert events[-1]["type"] == "complete"
+    assert len(fake_models.calls) == 6
+    assert fake_models.max_active == 2
+
+def test_cancelled_save_leaves_no_temporary_file(audio_generator, monkeypatch):
+    started = threading.Event()
+
+    def slow_process_segment(chunk_parts, output_path, *args):
+        # Stands in for a worker that is still encoding when the caller is cancelled
+        started.set()
+        time.sleep(0.1)
+        output_path.write_bytes(b"frames")
+        return False, (0.1, "hash")
+
+    monkeypatch.setattr(audio_generator_module, "process_segment", slow_process_segment)
+
+    async def run():
+        save = asyncio.ensure_future(audio_generator._save_segment([], None, -16.0))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        save.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await save
+
+    asyncio.run(run())
+    # Let a worker that was not waited for finish writing
+    time.sleep(0.2)
+
+    assert list(audio_generator.segments_dir.rglob("*.tmp")) == []
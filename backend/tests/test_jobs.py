@@ -0,0 +1,32 @@
+import asyncio
+
+from app.services.job_manager import Job, JobManager
+
+def test_audio_chunks_are_not_kept_in_the_replay_log():
+    async def run():
+        yield {"type": "progress", "stage": "generating"}
+        yield {"type": "audio_chunk", "data": "A" * 100000}
+        yield {"type": "complete", "segments": [{"path": "segments/a.mp3"}]}
+
+    async def main():
+        manager = JobManager(workers=1, max_queue=4, retention_seconds=60)
+        job = manager.submit("generate-audio", run)
+        return [event async for _, event in job.events.subscribe(after=0)]
+
+    events = asyncio.run(main())
+    assert [event["type"] for event in events] == ["progress", "complete"]
+
+def test_job_submission_disables_audio_streaming(monkeypatch):
+    from app.api.routes import jobs
+    from app.core.models import PodcastRequest
+
+    class FakeGenerator:
+        def generate(self, payload):
+            return payload
+
+    submitted = []
+    monkeypatch.setattr(jobs.job_manager, "submit", lambda kind, run: submitted.append(run) or Job(kind, run))
+    request = PodcastRequest(transcript="Alice: hi", voiceMappings={}, streamAudio=True)
+    asyncio.run(jobs.submit_generate_audio(request, FakeGenerator()))
+
+    assert submitted[0]()["streamAudio"] is False
@@ -0,0 +1,38 @@
+import warnings
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.services.audio_generator.loudness import LoudnessNormalizer
+
+FRAME_RATE = 24000
+
+def segment(seconds: float, amplitude: float) -> AudioSegment:
+    t = np.arange(int(FRAME_RATE * seconds)) / FRAME_RATE
+    samples = np.round(amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+    return AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=FRAME_RATE, channels=1)
+
+def samples(seg: AudioSegment) -> np.ndarray:
+    return np.frombuffer(seg.raw_data, dtype=np.int16)
+
+@pytest.mark.parametrize("seconds", [0.2, 1.0])
+@pytest.mark.parametrize("amplitude", [0, 3])  # silence, and about -80 LUFS
+def test_silent_and_near_silent_segments_are_left_alone(seconds, amplitude):
+    original = segment(seconds, amplitude)
+    normalizer = LoudnessNormalizer(target_lufs=-16.0)
+
+    loudness = normalizer.measure_batch([samples(original)[:, np.newaxis] / 32768.0], FRAME_RATE)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        normalized, = normalizer.normalize_segments([original])
+
+    assert loudness[0] == -np.inf
+    assert np.array_equal(samples(normalized), samples(original))
+
+def test_short_audible_segment_is_normalized():
+    normalizer = LoudnessNormalizer(target_lufs=-16.0)
+    normalized, = normalizer.normalize_segments([segment(0.2, 1000)])
+
+    measured = normalizer.measure_batch([samples(normalized)[:, np.newaxis] / 32768.0], FRAME_RATE)
+    assert measured[0] == pytest.approx(-16.0, abs=0.5)
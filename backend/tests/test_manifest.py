@@ -0,0 +1,57 @@
+import asyncio
+import json
+import threading
+
+from app.services.audio_generator.manifest import RunManifest
+from conftest import collect, make_speaker_config
+
+def record(manifest, index):
+    manifest.record(index, "Alice", f"hash{index}", "Kore", path=f"segments/{index}.mp3", duration=1.0)
+
+def test_records_are_batched_into_one_write_off_the_event_loop(tmp_path, monkeypatch):
+    manifest = RunManifest(tmp_path, tmp_path / "runs", "run1", checkpoint_interval=0.01)
+    writes = []
+    write = manifest._write
+
+    def recording_write(data):
+        writes.append((threading.current_thread() is threading.main_thread(), sorted(data["segments"])))
+        write(data)
+    monkeypatch.setattr(manifest, "_write", recording_write)
+
+    async def run():
+        for index in range(5):
+            record(manifest, index)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert writes == [(False, ["0", "1", "2", "3", "4"])]
+    assert sorted(json.loads(manifest.path.read_text())["segments"]) == ["0", "1", "2", "3", "4"]
+
+def test_close_writes_pending_records(tmp_path):
+    manifest = RunManifest(tmp_path, tmp_path / "runs", "run1", checkpoint_interval=60)
+
+    async def run():
+        record(manifest, 0)
+        assert not manifest.path.exists()
+        await manifest.close()
+
+    asyncio.run(run())
+
+    loaded = RunManifest.load(tmp_path, tmp_path / "runs", "run1")
+    assert loaded.data["segments"]["0"]["status"] == "completed"
+
+def test_finished_run_checkpoints_every_turn(audio_generator, fake_models):
+    request = {
+        "transcript": "Alice: Hi Bob.\nBob: Hi Alice.\nAlice: Shall we start?",
+        "voiceMappings": {
+            "Alice": {"voice": "Kore", "config": make_speaker_config("Alice")},
+            "Bob": {"voice": "Puck", "config": make_speaker_config("Bob")}
+        },
+        "useCache": False
+    }
+
+    events = collect(audio_generator.generate(request))
+
+    manifest = RunManifest.load(audio_generator.output_dir, audio_generator.runs_dir, events[-1]["runId"])
+    assert [entry["status"] for entry in manifest.data["segments"].values()] == ["completed"] * 3
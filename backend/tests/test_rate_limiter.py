@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import rate_limiter
+from app.services.rate_limiter import AdaptiveConcurrencyLimiter, GeminiRateLimiter, TokenBucket
+
+class FakeAPIError(Exception):
+    """An SDK error carrying an HTTP status code."""
+
+    def __init__(self, code: int):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+class FlakyClient:
+    """Fake model call that fails with the given status codes before succeeding."""
+
+    def __init__(self, *failures: int):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def generate_content(self):
+        self.calls += 1
+        if self.failures:
+            raise FakeAPIError(self.failures.pop(0))
+        return "audio"
+
+def make_limiter(max_retries: int = 4, base_delay: float = 0.01) -> GeminiRateLimiter:
+    return GeminiRateLimiter(
+        bucket=TokenBucket(rate=0, capacity=1),
+        concurrency=AdaptiveConcurrencyLimiter(initial=8, minimum=1, maximum=16, cooldown=0),
+        max_retries=max_retries,
+        base_delay=base_delay
+    )
+
+def test_throttled_call_is_retried_with_backoff(monkeypatch):
+    # Always back off for the full jittered delay: base_delay * 2 ** attempt
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    limiter = make_limiter(base_delay=0.02)
+    client = FlakyClient(429, 429)
+
+    started = time.monotonic()
+    result = asyncio.run(limiter.call(client.generate_content))
+    elapsed = time.monotonic() - started
+
+    assert result == "audio"
+    assert client.calls == 3
+    assert limiter.retries == 2
+    assert limiter.throttled == 2
+    assert elapsed >= 0.02 + 0.04
+
+def test_retries_give_up_after_max_retries():
+    limiter = make_limiter(max_retries=2)
+    client = FlakyClient(429, 429, 429, 429)
+
+    with pytest.raises(FakeAPIError):
+        asyncio.run(limiter.call(client.generate_content))
+    assert client.calls == 3
+    assert limiter.failures == 1
+
+@pytest.mark.parametrize("error", [FakeAPIError(400), ValueError("bad request")])
+def test_non_retryable_error_is_not_retried(error):
+    limiter = make_limiter()
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        raise error
+
+    with pytest.raises(type(error)):
+        asyncio.run(limiter.call(fail))
+    assert calls == 1
+    assert limiter.retries == 0
+    assert limiter.failures == 1
+
+def test_limit_drops_on_throttle_and_recovers_after_successes():
+    limiter = make_limiter()
+    client = FlakyClient(429)
+
+    asyncio.run(limiter.call(client.generate_content))
+    # Halved by the 429, then nudged up by the successful retry
+    assert limiter.concurrency.decreases == 1
+    assert 4 < limiter.concurrency.limit < 5
+
+    async def succeed_many(count: int):
+        for _ in range(count):
+            await limiter.call(FlakyClient().generate_content)
+
+    asyncio.run(succeed_many(20))
+    assert limiter.concurrency.limit > 6
+    assert limiter.concurrency.increases == 21
+
+def test_throttle_decrease_respects_cooldown():
+    concurrency = AdaptiveConcurrencyLimiter(initial=8, minimum=1, maximum=16, cooldown=60)
+
+    async def throttle_burst():
+        for _ in range(3):
+            await concurrency.acquire()
+            await concurrency.release(throttled=True)
+
+    asyncio.run(throttle_burst())
+    assert concurrency.limit == 4
+    assert concurrency.decreases == 1
+
+def test_limit_caps_calls_in_flight():
+    concurrency = AdaptiveConcurrencyLimiter(initial=2, minimum=1, maximum=2)
+    active = 0
+    peak = 0
+
+    async def worker():
+        nonlocal active, peak
+        await concurrency.acquire()
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        await concurrency.release()
+
+    async def main():
+        await asyncio.gather(*[worker() for _ in range(6)])
+
+    asyncio.run(main())
+    assert peak == 2
+
+def test_token_bucket_allows_burst_then_refills_at_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    async def acquire_three():
+        return [await bucket.acquire() for _ in range(3)]
+
+    waits = asyncio.run(acquire_three())
+    # The burst is served immediately; the third token takes 1 / rate seconds to refill
+    assert waits[0] < 0.01 and waits[1] < 0.01
+    assert 0.04 <= waits[2] < 0.2
+
+def test_token_bucket_disabled_when_rate_is_zero():
+    bucket = TokenBucket(rate=0, capacity=1)
+
+    async def acquire_many():
+        return [await bucket.acquire() for _ in range(100)]
+
+    assert asyncio.run(acquire_many()) == [0.0] * 100
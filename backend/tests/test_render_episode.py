@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes.audio import get_audio_generator
+from app.main import app
+
+@pytest.fixture
+def client(audio_generator, monkeypatch):
+    """A test client whose routes use ``audio_generator``, with rendering and storage stubbed out."""
+    renders = []
+    writes = []
+
+    async def fake_render(segments, output_path):
+        # Stands in for the ffmpeg encoder: stream the bytes, then move the file into place
+        renders.append(output_path)
+        yield b"ID3"
+        yield b"frames"
+        output_path.write_bytes(b"ID3frames")
+
+    monkeypatch.setattr(audio_generator.renderer, "render", fake_render)
+    monkeypatch.setattr(audio_generator.storage, "note_write", writes.append)
+    app.dependency_overrides[get_audio_generator] = lambda: audio_generator
+    with TestClient(app) as test_client:
+        test_client.renders, test_client.writes = renders, writes
+        yield test_client
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def segments(audio_generator):
+    paths = []
+    for name in ("a.mp3", "b.mp3"):
+        path = audio_generator.segments_dir / name
+        path.write_bytes(b"segment")
+        paths.append(audio_generator.renderer.relative_path(path))
+    return paths
+
+def test_streamed_render_is_recorded_with_storage(client, segments):
+    response = client.post("/api/render-episode", json={"segments": segments, "stream": True})
+
+    assert response.status_code == 200
+    assert response.content == b"ID3frames"
+    assert len(client.renders) == 1
+    assert client.writes == client.renders
+
+def test_streamed_render_reuses_existing_episode(client, segments):
+    first = client.post("/api/render-episode", json={"segments": segments, "stream": True})
+    second = client.post("/api/render-episode", json={"segments": segments, "stream": True})
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["X-Episode-Url"] == first.headers["X-Episode-Url"]
+    assert len(client.renders) == 1
+
+def test_non_stream_render_reuses_streamed_episode(client, segments):
+    client.post("/api/render-episode", json={"segments": segments, "stream": True})
+    response = client.post("/api/render-episode", json={"segments": segments})
+
+    assert response.json()["audioUrl"] == f"/audio/{response.json()['path']}"
+    assert len(client.renders) == 1
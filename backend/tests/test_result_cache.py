@@ -0,0 +1,43 @@
+import asyncio
+
+from app.services.result_cache import CoalescingCache
+
+def counting_compute():
+    calls = []
+
+    async def compute():
+        calls.append(None)
+        take = len(calls)
+        await asyncio.sleep(0.01)
+        return {"transcript": f"take {take}"}
+    return calls, compute
+
+def test_cached_result_is_reused():
+    cache = CoalescingCache(ttl_seconds=60, max_bytes=1_000_000)
+    calls, compute = counting_compute()
+
+    async def main():
+        first = await cache.get_or_compute("key", compute)
+        second = await cache.get_or_compute("key", compute)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == second == {"transcript": "take 1"}
+    assert len(calls) == 1 and cache.hits == 1
+
+def test_use_cache_off_bypasses_cached_and_in_flight_results():
+    cache = CoalescingCache(ttl_seconds=60, max_bytes=1_000_000)
+    calls, compute = counting_compute()
+
+    async def main():
+        await cache.get_or_compute("key", compute)
+        # Neither the cached result nor an identical call in flight is reused
+        return await asyncio.gather(
+            cache.get_or_compute("key", compute, use_cache=False),
+            cache.get_or_compute("key", compute, use_cache=False)
+        )
+
+    fresh = asyncio.run(main())
+    assert len(calls) == 3
+    assert {result["transcript"] for result in fresh} == {"take 2", "take 3"}
+    assert cache.bypassed == 2 and cache.stats()["entries"] == 1
@@ -0,0 +1,47 @@
+from conftest import collect
+
+SPEAKER_CONFIG = {"name": "Host"}
+
+def single_segment_request(**overrides):
+    request = {
+        "speaker": "Host",
+        "text": "Welcome to the show.",
+        "voiceConfig": {"voice": "Kore", "config": SPEAKER_CONFIG}
+    }
+    request.update(overrides)
+    return request
+
+def test_single_segment_completes(audio_generator):
+    async def fake_generate_segment(text, voice, speaker_config, **kwargs):
+        return 1.5, "segments/host.mp3"
+
+    audio_generator._generate_segment = fake_generate_segment
+    events = collect(audio_generator.generate_single_segment(single_segment_request()))
+
+    assert [event["type"] for event in events] == ["progress", "progress", "segment_complete", "complete"]
+    assert events[2]["segment_path"] == "segments/host.mp3"
+    assert events[-1]["segments"] == [{"speaker": "Host", "path": "segments/host.mp3", "duration": 1.5}]
+
+def test_single_segment_streams_chunks(audio_generator):
+    async def fake_generate_segment(text, voice, speaker_config, on_chunk=None, **kwargs):
+        await on_chunk(b"\x00\x01", "audio/L16;rate=24000")
+        await on_chunk(b"\x02\x03", "audio/L16;rate=24000")
+        return 0.5, "segments/host.mp3"
+
+    audio_generator._generate_segment = fake_generate_segment
+    events = collect(audio_generator.generate_single_segment(single_segment_request(streamAudio=True)))
+
+    chunks = [event for event in events if event["type"] == "audio_chunk"]
+    assert [chunk["sequence"] for chunk in chunks] == [0, 1]
+    assert events[-1]["type"] == "complete"
+    assert events[-1]["segments"][0]["duration"] == 0.5
+
+def test_audio_chunks_are_not_logged(capsys):
+    from app.api.routes.audio import log_update
+
+    log_update("segment", {"type": "audio_chunk", "data": "A" * 100000})
+    log_update("segment", {"type": "progress", "stage": "generating"})
+
+    output = capsys.readouterr().out
+    assert "AAAA" not in output
+    assert "generating" in output
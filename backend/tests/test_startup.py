@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def test_importing_app_does_no_filesystem_setup(tmp_path):
+    script = (
+        "import app.main\n"
+        "import app.api.routes.audio as audio\n"
+        "assert audio._audio_generator is None\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR))
+    subprocess.run([sys.executable, "-W", "ignore", "-c", script], cwd=tmp_path, env=env, check=True)
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_storage_collector_runs_for_the_app_lifespan(audio_generator):
+    from fastapi.testclient import TestClient
+
+    from app.api.routes.audio import get_audio_generator
+    from app.main import app
+
+    app.dependency_overrides[get_audio_generator] = lambda: audio_generator
+    try:
+        # Without the lifespan the stats route only reads, it never starts the collector
+        assert TestClient(app).get("/api/stats/storage").json()["running"] is False
+
+        with TestClient(app) as client:
+            assert client.get("/api/stats/storage").json()["running"] is True
+        assert audio_generator.storage.stats()["running"] is False
+    finally:
+        app.dependency_overrides.clear()
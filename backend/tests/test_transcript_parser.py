@@ -0,0 +1,101 @@
+import random
+import re
+
+from app.services.transcript_parser import TranscriptParser, parse_transcript
+
+SPEAKERS = ["Alice", "Bob", "  Dr. Carol ", "", "José"]
+WORDS = ["well", "the", "podcast", "isn't", "really", "about", "that", "—", "42", "ok?"]
+
+def legacy_parse(transcript: str):
+    """The line parser AudioGenerator.generate used before TranscriptParser."""
+    segments = []
+    current_speaker = None
+    current_text = []
+
+    for line in transcript.split("\n"):
+        if not line.strip():
+            continue
+
+        if ":" in line:
+            if current_speaker and current_text:
+                segments.append((current_speaker, " ".join(current_text)))
+                current_text = []
+
+            speaker, text = line.split(":", 1)
+            current_speaker = speaker.strip()
+            current_text = [text.strip()]
+        else:
+            current_text.append(line.strip())
+
+    if current_speaker and current_text:
+        segments.append((current_speaker, " ".join(current_text)))
+    return segments
+
+def legacy_invalid_lines(transcript: str):
+    """The lines TranscriptValidator rejected before TranscriptParser."""
+    lines = [line.strip() for line in transcript.split("\n") if line.strip()]
+    return [line for line in lines if not re.match(r"^[^:]+:\s+", line)]
+
+def make_transcript(target_bytes: int, seed: int = 0) -> str:
+    """A transcript mixing well-formed turns with every kind of line the parsers treat specially."""
+    rng = random.Random(seed)
+    lines = ["Intro text before any speaker"]
+    size = 0
+    while size < target_bytes:
+        words = " ".join(rng.choices(WORDS, k=rng.randint(0, 40)))
+        kind = rng.random()
+        if kind < 0.7:
+            line = f"{rng.choice(SPEAKERS)}: {words}"
+        elif kind < 0.8:
+            line = f"  {words}  "  # Continuation line
+        elif kind < 0.85:
+            line = ""
+        elif kind < 0.9:
+            line = f"{rng.choice(SPEAKERS)}:{words}"  # No space after the colon
+        elif kind < 0.95:
+            line = f"{rng.choice(SPEAKERS)}: {words}: with a second colon\r"
+        else:
+            line = f"{rng.choice(SPEAKERS)}:"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+TRANSCRIPT = make_transcript(2_000_000)
+
+def test_matches_legacy_parser_on_multi_mb_transcript():
+    turns = parse_transcript(TRANSCRIPT)
+
+    assert len(TRANSCRIPT) > 2_000_000
+    assert [(turn.speaker, turn.text) for turn in turns] == legacy_parse(TRANSCRIPT)
+
+def test_malformed_lines_match_legacy_validator():
+    parser = TranscriptParser()
+    parser.feed(TRANSCRIPT)
+    parser.finish()
+
+    assert [line for _, line in parser.malformed] == legacy_invalid_lines(TRANSCRIPT)
+
+def test_chunked_feed_matches_whole_parse():
+    rng = random.Random(1)
+    parser = TranscriptParser()
+    position = 0
+    while position < len(TRANSCRIPT):
+        size = rng.randint(1, 4096)
+        parser.feed(TRANSCRIPT[position:position + size])
+        position += size
+    turns = parser.finish()
+
+    whole = parse_transcript(TRANSCRIPT)
+    assert [(t.speaker, t.text, t.start, t.end, t.line, t.end_line) for t in turns] == \
+        [(t.speaker, t.text, t.start, t.end, t.line, t.end_line) for t in whole]
+
+def test_batch_parse_matches_incremental_parse():
+    incremental = TranscriptParser()
+    incremental.feed(TRANSCRIPT)
+    incremental.finish()
+    batch = TranscriptParser()
+    batch.parse(TRANSCRIPT)
+
+    assert list(batch.turns) == list(incremental.turns)
+    assert batch.malformed == incremental.malformed
+    assert batch.speaker_turns == incremental.speaker_turns
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.models import ConceptRequest
+from app.services import rate_limiter
+from app.services.transcript_generator import transcript_generator as transcript_generator_module
+from app.services.transcript_generator.transcript_generator import TranscriptGenerator
+from conftest import collect
+
+class FakeAPIError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+class FakeStreamingModels:
+    """
+    Stand-in for ``client.aio.models`` streaming scripted attempts.
+
+    Each attempt is a list of text chunks; an ``int`` in it raises that status code at
+    that point of the stream (at position 0, before anything is streamed).
+    """
+
+    def __init__(self, *attempts):
+        self.attempts = list(attempts)
+        self.calls = 0
+
+    async def generate_content_stream(self, model, contents, config):
+        self.calls += 1
+        script = self.attempts.pop(0)
+        if script and isinstance(script[0], int):
+            raise FakeAPIError(script[0])
+
+        async def stream():
+            for item in script:
+                if isinstance(item, int):
+                    raise FakeAPIError(item)
+                yield SimpleNamespace(text=item, candidates=[object()])
+        return stream()
+
+@pytest.fixture
+def stream_models(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transcript_generator_module, "gemini_limiter", rate_limiter.GeminiRateLimiter(
+        bucket=rate_limiter.TokenBucket(rate=0, capacity=1),
+        concurrency=rate_limiter.AdaptiveConcurrencyLimiter(initial=4, minimum=1, maximum=4),
+        max_retries=3,
+        base_delay=0.001
+    ))
+
+    def install(*attempts):
+        models = FakeStreamingModels(*attempts)
+        client = SimpleNamespace(aio=SimpleNamespace(models=models))
+        monkeypatch.setattr(transcript_generator_module, "get_gemini_client", lambda: client)
+        return models
+    return install
+
+def collect_into(events, generator):
+    """Like ``collect``, but keeps the events yielded before an error."""
+    async def run():
+        async for event in generator:
+            events.append(event)
+    asyncio.run(run())
+
+def concept_request():
+    return ConceptRequest(
+        topic="tides", num_speakers=2, character_names=["Alice", "Bob"],
+        expertise_level="beginner", duration_minutes=1, format_style="casual"
+    )
+
+def test_stream_yields_lines_across_chunk_boundaries(stream_models):
+    stream_models(["Alice: Hello th", "ere.\n\nBob: Hi", " Alice.\nAlice: Bye"])
+
+    events = collect(TranscriptGenerator().generate_stream(concept_request()))
+
+    lines = [(event["lineNumber"], event["line"]) for event in events if event["type"] == "transcript_line"]
+    assert lines == [(1, "Alice: Hello there."), (3, "Bob: Hi Alice."), (4, "Alice: Bye")]
+    assert events[-1]["type"] == "complete"
+    assert events[-1]["transcript"] == "Alice: Hello there.\n\nBob: Hi Alice.\nAlice: Bye"
+
+def test_throttled_stream_is_retried_before_first_line(stream_models):
+    # Throttled when opening the stream, then after a partial line that was never sent
+    models = stream_models([429], ["Alice: Hel", 429], ["Alice: Hello.\nBob: Hi.\n"])
+
+    events = collect(TranscriptGenerator().generate_stream(concept_request()))
+
+    assert models.calls == 3
+    assert [event["type"] for event in events] == ["progress", "transcript_line", "transcript_line", "complete"]
+    assert transcript_generator_module.gemini_limiter.retries == 2
+
+def test_throttled_stream_is_not_retried_after_a_line_was_sent(stream_models):
+    models = stream_models(["Alice: Hello.\nBob: Hi", 429], ["Alice: Hello.\nBob: Hi.\n"])
+
+    events = []
+    with pytest.raises(FakeAPIError):
+        collect_into(events, TranscriptGenerator().generate_stream(concept_request()))
+
+    assert models.calls == 1
+    assert [event["line"] for event in events if event["type"] == "transcript_line"] == ["Alice: Hello."]
+
+def test_invalid_line_retries_with_correction(stream_models):
+    models = stream_models(["not a speaker line\n"], ["Alice: Hello.\nBob: Hi.\n"])
+
+    events = collect(TranscriptGenerator().generate_stream(concept_request()))
+
+    assert models.calls == 2
+    assert [event["type"] for event in events if event["type"] in ("retry", "complete")] == ["retry", "complete"]
+
+def test_validation_gives_up_after_max_retries(stream_models):
+    stream_models(*[["not a speaker line\n"]] * 3)
+
+    with pytest.raises(HTTPException):
+        collect(TranscriptGenerator().generate_stream(concept_request()))
@@ -379,7 +379,8 @@ const AppContent = () => {
   const handleGenerateSegmentAudio = async (
     index: number,
     speaker: string, 
-    text: string
+    text: string,
+    useCache: boolean = true
   ): Promise<void> => {
     // This function now correctly uses the generateSegmentAudio from useAudio context
     if (!generateSegmentAudio) {
@@ -473,7 +474,7 @@ const AppContent = () => {
       };
 
       // Call the context function - it returns the absolute URL when done
-      const absoluteAudioUrl = await generateSegmentAudio(speaker, text, speakerMappings);
+      const absoluteAudioUrl = await generateSegmentAudio(speaker, text, speakerMappings, useCache);
 
       // Update the specific turn in App state with the received URL
       handleTurnUpdate(index, { audioUrl: absoluteAudioUrl });
@@ -76,7 +76,7 @@ interface TranscriptEditorProps {
   isLoading: boolean;
   characters: string[];
   voiceMappings?: Record<string, SpeakerVoiceMapping>;
-  onGenerateSegmentAudio?: (index: number, speaker: string, text: string) => Promise<void>;
+  onGenerateSegmentAudio?: (index: number, speaker: string, text: string, useCache?: boolean) => Promise<void>;
   wordCount: number | null;
   estimatedDurationMinutes: number | null;
   targetDurationMinutes: number | null;
@@ -187,7 +187,7 @@ const TranscriptEditor: React.FC<TranscriptEditorProps> = ({
     onSave();
   };
 
-  const handleGenerateAudio = async (index: number) => {
+  const handleGenerateAudio = async (index: number, regenerate: boolean = false) => {
     try {
       const turn = turns[index];
       
@@ -210,7 +210,7 @@ const TranscriptEditor: React.FC<TranscriptEditorProps> = ({
       
       // Call the prop function to initiate generation
       // The parent component will handle the stream and call onTurnUpdate when done
-      await onGenerateSegmentAudio(index, turn.speaker, turn.content);
+      await onGenerateSegmentAudio(index, turn.speaker, turn.content, !regenerate);
       
       return true; // Indicate initiation success
     } catch (err) {
@@ -576,7 +576,7 @@ const TranscriptEditor: React.FC<TranscriptEditorProps> = ({
                               `}
                               onClick={(e) => {
                                 e.stopPropagation();
-                                handleGenerateAudio(index);
+                                handleGenerateAudio(index, Boolean(turn.audioUrl));
                               }}
                               disabled={generatingAudioIndices.has(index)}
                               aria-label={`Generate audio for ${turn.speaker}`}
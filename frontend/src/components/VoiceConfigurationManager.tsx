@@ -154,7 +154,8 @@ const VoiceConfigurationManager: React.FC<VoiceConfigurationManagerProps> = ({
   const handleGenerateSegmentAudio = async (
     index: number,
     speakerName: string, 
-    text: string
+    text: string,
+    useCache: boolean = true
   ): Promise<void> => {
     try {
       setError(null);
@@ -163,7 +164,7 @@ const VoiceConfigurationManager: React.FC<VoiceConfigurationManagerProps> = ({
         throw new Error(`No voice configuration found for speaker: ${speakerName}`);
       }
       
-      await generateSegmentAudio(speakerName, text, voiceMappings);
+      await generateSegmentAudio(speakerName, text, voiceMappings, useCache);
 
     } catch (error) {
       const errorMessage = error instanceof Error ? error.message : 'An unknown error occurred';
@@ -14,7 +14,7 @@ interface AudioContextType {
   audioUrl: string | null;
   
   // Segment audio generation
-  generateSegmentAudio: (speaker: string, text: string, voiceMappings: Record<string, SpeakerVoiceMapping>) => Promise<string>;
+  generateSegmentAudio: (speaker: string, text: string, voiceMappings: Record<string, SpeakerVoiceMapping>, useCache?: boolean) => Promise<string>;
   isGeneratingSegment: boolean;
   segmentError: string | null;
   
@@ -53,9 +53,10 @@ export const AudioProvider: React.FC<{ children: React.ReactNode; apiBaseUrl?: s
   const generateSegmentAudio = async (
     speaker: string, 
     text: string, 
-    voiceMappings: Record<string, SpeakerVoiceMapping>
+    voiceMappings: Record<string, SpeakerVoiceMapping>,
+    useCache: boolean = true
   ): Promise<string> => {
-    return await generateSegmentAudioHook(speaker, text, voiceMappings);
+    return await generateSegmentAudioHook(speaker, text, voiceMappings, useCache);
   };
 
   const clearAudioState = () => {
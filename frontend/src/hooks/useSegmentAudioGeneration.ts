@@ -2,7 +2,7 @@ import { useState } from 'react';
 import { SpeakerVoiceMapping } from '../types/speaker';
 
 interface UseSegmentAudioGenerationReturn {
-  generateSegmentAudio: (speaker: string, text: string, voiceMappings: Record<string, SpeakerVoiceMapping>) => Promise<string>;
+  generateSegmentAudio: (speaker: string, text: string, voiceMappings: Record<string, SpeakerVoiceMapping>, useCache?: boolean) => Promise<string>;
   isGenerating: boolean;
   error: string | null;
 }
@@ -14,7 +14,8 @@ export function useSegmentAudioGeneration(apiBaseUrl: string = ''): UseSegmentAu
   const generateSegmentAudio = async (
     speaker: string, 
     text: string, 
-    voiceMappings: Record<string, SpeakerVoiceMapping>
+    voiceMappings: Record<string, SpeakerVoiceMapping>,
+    useCache: boolean = true
   ): Promise<string> => {
     try {
       setIsGenerating(true);
@@ -28,7 +29,9 @@ export function useSegmentAudioGeneration(apiBaseUrl: string = ''): UseSegmentAu
       const payload = {
         speaker,
         text,
-        voiceConfig: voiceMappings[speaker]
+        voiceConfig: voiceMappings[speaker],
+        // Regenerating skips the server's segment cache, which would return the same audio
+        useCache
       };
       console.log('Segment audio payload:', JSON.stringify(payload, null, 2));
       
@@ -4,13 +4,22 @@ export interface AudioSegment {
   speaker: string;
   path: string;
   duration: number;
+  turns?: number[];
 }
 
 export interface ProgressUpdate {
-  type: 'progress' | 'segment_complete' | 'error' | 'complete';
+  type: 'run_started' | 'progress' | 'audio_chunk' | 'segment_complete' | 'episode_complete' | 'error' | 'complete';
   stage: string;
   message?: string;
   speaker?: string;
+  index?: number;
+  speakers?: string[];
+  turns?: number[];
+  runId?: string;
+  resumed?: boolean | number;
+  sequence?: number;
+  mimeType?: string;
+  data?: string;
   segment_path?: string;
   duration?: number;
   error?: string;
@@ -25,4 +34,12 @@ export interface ProgressUpdate {
 export interface GenerationRequest {
   transcript: string;
   voiceMappings: Record<string, VoiceConfig>;
+  maxConcurrency?: number;
+  eventOrder?: 'transcript' | 'completion';
+  useCache?: boolean;
+  renderEpisode?: boolean;
+  streamAudio?: boolean;
+  splitLongTurns?: boolean;
+  batchTurns?: boolean;
+  resumeRunId?: string;
 }